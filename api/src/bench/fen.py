@@ -0,0 +1,63 @@
+"""Throughput of FEN parsing and generation.
+
+python -m src.bench.fen [--positions N] [--repeat N]
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, List
+
+from ..core.logic import generate_fen, new_game, parse_fen
+from ..core.movegen import legal_moves
+from ..core.position import Position, _parse_placement
+
+
+def sample_fens(count: int, seed: int = 1) -> List[str]:
+    """Distinct positions reached by random play from the start."""
+    rng = random.Random(seed)
+    fens = {}
+    while len(fens) < count:
+        game = new_game()
+        for _ in range(rng.randrange(1, 80)):
+            moves = legal_moves(game)
+            if not moves:
+                break
+            game.push(rng.choice(moves))
+            fens[generate_fen(game)] = None
+    return list(fens)[:count]
+
+
+def _rate(label: str, fn: Callable, items: list, repeat: int) -> None:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            fn(item)
+    elapsed = time.perf_counter() - start
+    total = len(items) * repeat
+    print(f"{label:<32} {total / elapsed:>12,.0f} positions/s")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark FEN parsing")
+    parser.add_argument("--positions", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    fens = sample_fens(args.positions)
+
+    _parse_placement.cache_clear()
+    _rate("Position.from_fen (unique)", Position.from_fen, fens, 1)
+    _rate("Position.from_fen (repeated)", Position.from_fen, fens, args.repeat)
+    _parse_placement.cache_clear()
+    _rate("parse_fen (unique)", parse_fen, fens, 1)
+    _rate("parse_fen (repeated)", parse_fen, fens, args.repeat)
+
+    games = [Position.from_fen(fen) for fen in fens]
+    _rate("generate_fen (cold)", generate_fen, games, 1)
+    _rate("generate_fen (memoized)", generate_fen, games, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,159 @@
+"""Bitboard primitives and precomputed attack tables.
+
+Squares are numbered ``row * 8 + col`` so they line up with the (row, col)
+coordinates used everywhere else in the API: a8 is square 0 and h1 is 63.
+"""
+
+from typing import Iterator, List, Tuple
+
+ROWS = 8
+COLS = 8
+SQUARES = ROWS * COLS
+
+WHITE = 0
+BLACK = 1
+
+# (row, col) steps
+NORTH = (-1, 0)
+SOUTH = (1, 0)
+WEST = (0, -1)
+EAST = (0, 1)
+NORTH_WEST = (-1, -1)
+NORTH_EAST = (-1, 1)
+SOUTH_WEST = (1, -1)
+SOUTH_EAST = (1, 1)
+
+ROOK_DIRECTIONS = (NORTH, SOUTH, WEST, EAST)
+BISHOP_DIRECTIONS = (NORTH_WEST, NORTH_EAST, SOUTH_WEST, SOUTH_EAST)
+
+KNIGHT_STEPS = ((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1))
+KING_STEPS = ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+
+
+def square(r: int, c: int) -> int:
+    return r * COLS + c
+
+
+def coords(sq: int) -> Tuple[int, int]:
+    return sq >> 3, sq & 7
+
+
+def bit(sq: int) -> int:
+    return 1 << sq
+
+
+def lsb(bb: int) -> int:
+    return (bb & -bb).bit_length() - 1
+
+
+def msb(bb: int) -> int:
+    return bb.bit_length() - 1
+
+
+def iter_squares(bb: int) -> Iterator[int]:
+    while bb:
+        low = bb & -bb
+        yield low.bit_length() - 1
+        bb ^= low
+
+
+def _step_table(steps) -> List[int]:
+    table = []
+    for sq in range(SQUARES):
+        r, c = coords(sq)
+        mask = 0
+        for dr, dc in steps:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < ROWS and 0 <= nc < COLS:
+                mask |= 1 << square(nr, nc)
+        table.append(mask)
+    return table
+
+
+def _ray_table(direction) -> List[int]:
+    dr, dc = direction
+    table = []
+    for sq in range(SQUARES):
+        r, c = coords(sq)
+        mask = 0
+        r, c = r + dr, c + dc
+        while 0 <= r < ROWS and 0 <= c < COLS:
+            mask |= 1 << square(r, c)
+            r, c = r + dr, c + dc
+        table.append(mask)
+    return table
+
+
+KNIGHT_ATTACKS = _step_table(KNIGHT_STEPS)
+KING_ATTACKS = _step_table(KING_STEPS)
+# PAWN_ATTACKS[color][sq]: squares a pawn of `color` on `sq` attacks
+PAWN_ATTACKS = (
+    _step_table(((-1, -1), (-1, 1))),
+    _step_table(((1, -1), (1, 1))),
+)
+
+RAYS = {direction: _ray_table(direction) for direction in KING_STEPS}
+
+# Rays that run towards higher square numbers find their nearest blocker with
+# the lowest set bit, the others with the highest.
+_RAY_S = RAYS[SOUTH]
+_RAY_E = RAYS[EAST]
+_RAY_N = RAYS[NORTH]
+_RAY_W = RAYS[WEST]
+_RAY_SE = RAYS[SOUTH_EAST]
+_RAY_SW = RAYS[SOUTH_WEST]
+_RAY_NE = RAYS[NORTH_EAST]
+_RAY_NW = RAYS[NORTH_WEST]
+
+
+def rook_attacks(sq: int, occupied: int) -> int:
+    attacks = 0
+    for rays in (_RAY_S, _RAY_E):
+        ray = rays[sq]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= rays[(blockers & -blockers).bit_length() - 1]
+        attacks |= ray
+    for rays in (_RAY_N, _RAY_W):
+        ray = rays[sq]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= rays[blockers.bit_length() - 1]
+        attacks |= ray
+    return attacks
+
+
+def bishop_attacks(sq: int, occupied: int) -> int:
+    attacks = 0
+    for rays in (_RAY_SE, _RAY_SW):
+        ray = rays[sq]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= rays[(blockers & -blockers).bit_length() - 1]
+        attacks |= ray
+    for rays in (_RAY_NE, _RAY_NW):
+        ray = rays[sq]
+        blockers = ray & occupied
+        if blockers:
+            ray ^= rays[blockers.bit_length() - 1]
+        attacks |= ray
+    return attacks
+
+
+def _between_tables() -> Tuple[List[List[int]], List[List[int]]]:
+    between = [[0] * SQUARES for _ in range(SQUARES)]
+    line = [[0] * SQUARES for _ in range(SQUARES)]
+    for direction in KING_STEPS:
+        opposite = (-direction[0], -direction[1])
+        for a in range(SQUARES):
+            ray = RAYS[direction][a]
+            full = ray | RAYS[opposite][a] | (1 << a)
+            for b in iter_squares(ray):
+                between[a][b] = ray & ~RAYS[direction][b] & ~(1 << b)
+                line[a][b] = full
+    return between, line
+
+
+# BETWEEN[a][b]: squares strictly between two aligned squares, else 0
+# LINE[a][b]: the whole rank, file or diagonal through both, else 0
+BETWEEN, LINE = _between_tables()
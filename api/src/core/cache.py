@@ -0,0 +1,87 @@
+"""LRU cache of per-position results, keyed by Zobrist key.
+
+Everything stored depends only on what the key covers (pieces, side to
+move, castling rights, en passant), so a move or reset changes the key and
+the stale entry is simply never looked up again. The move clocks are not
+part of the key and are appended to the cached FEN on the way out.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import List, NamedTuple
+
+from .logic import generate_fen
+from .movegen import legal_moves
+from .position import Position
+
+DEFAULT_CAPACITY = 16384
+
+
+class PositionInfo(NamedTuple):
+    moves: List[int]
+    check: bool
+    checkmate: bool
+    stalemate: bool
+    # FEN without the halfmove clock and fullmove number
+    fen_prefix: str
+
+
+def analyze(position: Position) -> PositionInfo:
+    moves = legal_moves(position)
+    check = position.in_check()
+    fen_prefix = generate_fen(position).rsplit(" ", 2)[0]
+    return PositionInfo(
+        moves, check, check and not moves, not check and not moves, fen_prefix
+    )
+
+
+class PositionCache:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        self.capacity = capacity
+        self.entries: "OrderedDict[int, PositionInfo]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def lookup(self, position: Position) -> PositionInfo:
+        key = position.key
+        with self.lock:
+            info = self.entries.get(key)
+            if info is not None:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return info
+            self.misses += 1
+
+        info = analyze(position)
+        with self.lock:
+            self.entries[key] = info
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+        return info
+
+    def fen(self, position: Position) -> str:
+        prefix = self.lookup(position).fen_prefix
+        return f"{prefix} {position.halfmove_clock} {position.fullmove_number}"
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.entries),
+            "capacity": self.capacity,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+position_cache = PositionCache(
+    int(os.environ.get("CHESS_POSITION_CACHE_SIZE", DEFAULT_CAPACITY))
+)
@@ -0,0 +1,286 @@
+"""Best-move search.
+
+Negamax alpha-beta with iterative deepening, quiescence search and a
+Zobrist-keyed transposition table. Moves are ordered by transposition-table
+move, MVV-LVA for captures, killer moves and the history heuristic.
+"""
+
+import time
+from typing import List, NamedTuple, Optional
+
+from .evaluation import PIECE_VALUES, evaluate
+from .movegen import legal_moves
+from .position import Position
+
+MATE_SCORE = 30000
+# Scores beyond this are mates, stored relative to the node in the table
+MATE_BOUND = MATE_SCORE - 1000
+INFINITY = 32000
+MAX_PLY = 64
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+DEFAULT_MOVETIME = 1000  # ms
+MAX_MOVETIME = 10000  # ms
+# How many nodes to search between clock checks
+CLOCK_INTERVAL = 1024
+
+TT_MOVE_SCORE = 1 << 30
+CAPTURE_SCORE = 1 << 24
+PROMOTION_SCORE = 1 << 23
+KILLER_SCORE = 1 << 22
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class SearchResult(NamedTuple):
+    move: Optional[int]
+    score: int
+    depth: int
+    nodes: int
+    elapsed: float
+
+
+class TranspositionTable:
+    """Fixed-size table indexed by the low bits of the Zobrist key.
+
+    Replacement keeps the deeper entry, unless the slot holds the same
+    position or was written by an older search.
+    """
+
+    def __init__(self, size_bits: int = 17) -> None:
+        self.mask = (1 << size_bits) - 1
+        self.entries: List[Optional[tuple]] = [None] * (1 << size_bits)
+        self.generation = 0
+
+    def new_search(self) -> None:
+        self.generation = (self.generation + 1) & 0xFF
+
+    def clear(self) -> None:
+        self.entries = [None] * len(self.entries)
+
+    def probe(self, key: int) -> Optional[tuple]:
+        entry = self.entries[key & self.mask]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key: int, depth: int, flag: int, score: int, move: int) -> None:
+        index = key & self.mask
+        old = self.entries[index]
+        if old is None or old[0] == key or old[5] != self.generation or depth >= old[1]:
+            self.entries[index] = (key, depth, flag, score, move, self.generation)
+
+
+# Shared by every search in this process; keys identify positions, so games
+# can safely reuse each other's entries.
+table = TranspositionTable()
+
+
+def score_to_table(score: int, ply: int) -> int:
+    if score >= MATE_BOUND:
+        return score + ply
+    if score <= -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def score_from_table(score: int, ply: int) -> int:
+    if score >= MATE_BOUND:
+        return score - ply
+    if score <= -MATE_BOUND:
+        return score + ply
+    return score
+
+
+class Searcher:
+    def __init__(
+        self,
+        position: Position,
+        tt: TranspositionTable = table,
+        deadline: Optional[float] = None,
+    ) -> None:
+        self.position = position
+        self.tt = tt
+        self.deadline = deadline
+        self.nodes = 0
+        self.killers = [[0, 0] for _ in range(MAX_PLY + 1)]
+        self.history = [0] * 4096
+        self.root_move = 0
+
+    def check_clock(self) -> None:
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+    def order(self, moves: List[int], tt_move: int, ply: int) -> List[int]:
+        squares = self.position.squares
+        killers = self.killers[ply]
+        history = self.history
+        scored = []
+        for move in moves:
+            if move == tt_move:
+                score = TT_MOVE_SCORE
+            else:
+                victim = squares[move >> 6 & 63]
+                if victim is not None:
+                    score = (
+                        CAPTURE_SCORE
+                        + PIECE_VALUES[victim % 6] * 8
+                        - squares[move & 63] % 6
+                    )
+                elif move >> 12:
+                    score = PROMOTION_SCORE + (move >> 12)
+                elif move == killers[0]:
+                    score = KILLER_SCORE + 1
+                elif move == killers[1]:
+                    score = KILLER_SCORE
+                else:
+                    score = history[move & 4095]
+            scored.append((score, move))
+        scored.sort(reverse=True)
+        return [move for _, move in scored]
+
+    def quiescence(self, alpha: int, beta: int, ply: int) -> int:
+        self.nodes += 1
+        if self.nodes % CLOCK_INTERVAL == 0:
+            self.check_clock()
+
+        stand_pat = evaluate(self.position)
+        if stand_pat >= beta or ply >= MAX_PLY:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+
+        position = self.position
+        squares = position.squares
+        captures = [
+            move
+            for move in legal_moves(position)
+            if squares[move >> 6 & 63] is not None or move >> 12
+        ]
+        for move in self.order(captures, 0, ply):
+            position.push(move)
+            score = -self.quiescence(-beta, -alpha, ply + 1)
+            position.pop()
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        return alpha
+
+    def negamax(self, depth: int, alpha: int, beta: int, ply: int) -> int:
+        if depth <= 0:
+            return self.quiescence(alpha, beta, ply)
+
+        self.nodes += 1
+        if self.nodes % CLOCK_INTERVAL == 0:
+            self.check_clock()
+
+        position = self.position
+        if ply and position.halfmove_clock >= 100:
+            return 0
+
+        key = position.key
+        tt_move = 0
+        entry = self.tt.probe(key)
+        if entry is not None:
+            tt_move = entry[4]
+            if ply and entry[1] >= depth:
+                score = score_from_table(entry[3], ply)
+                flag = entry[2]
+                if (
+                    flag == EXACT
+                    or (flag == LOWER and score >= beta)
+                    or (flag == UPPER and score <= alpha)
+                ):
+                    return score
+
+        moves = legal_moves(position)
+        if not moves:
+            return -MATE_SCORE + ply if position.in_check() else 0
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = 0
+        squares = position.squares
+        for move in self.order(moves, tt_move, ply):
+            quiet = squares[move >> 6 & 63] is None and not move >> 12
+            position.push(move)
+            score = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            position.pop()
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if not ply:
+                        self.root_move = move
+                    if alpha >= beta:
+                        if quiet:
+                            killers = self.killers[ply]
+                            if killers[0] != move:
+                                killers[1] = killers[0]
+                                killers[0] = move
+                            self.history[move & 4095] += depth * depth
+                        break
+
+        if best_score <= original_alpha:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.tt.store(key, depth, flag, score_to_table(best_score, ply), best_move)
+        return best_score
+
+    def iterate(self, max_depth: int) -> SearchResult:
+        start = time.perf_counter()
+        position = self.position
+        root_history = len(position.history)
+        moves = legal_moves(position)
+        if not moves:
+            return SearchResult(None, 0, 0, 0, 0.0)
+
+        best = SearchResult(moves[0], 0, 0, 0, 0.0)
+        for depth in range(1, max_depth + 1):
+            self.root_move = 0
+            try:
+                score = self.negamax(depth, -INFINITY, INFINITY, 0)
+            except SearchTimeout:
+                # Unwind the moves pushed by the aborted iteration. A root
+                # move that already beat the others searched so far is
+                # still better than the previous iteration's choice.
+                while len(position.history) > root_history:
+                    position.pop()
+                if self.root_move:
+                    best = best._replace(move=self.root_move)
+                break
+            best = SearchResult(self.root_move, score, depth, 0, 0.0)
+            if abs(score) >= MATE_BOUND:
+                break
+        return best._replace(nodes=self.nodes, elapsed=time.perf_counter() - start)
+
+
+def search(
+    position: Position,
+    depth: Optional[int] = None,
+    movetime: Optional[int] = None,
+    tt: TranspositionTable = table,
+) -> SearchResult:
+    """Find the best move for the side to move.
+
+    Searches a copy of `position`. `depth` caps the iterative deepening and
+    `movetime` (ms) bounds the wall-clock time; with neither, the search
+    runs for DEFAULT_MOVETIME.
+    """
+    if movetime is None and depth is None:
+        movetime = DEFAULT_MOVETIME
+    movetime = min(movetime or MAX_MOVETIME, MAX_MOVETIME)
+    deadline = time.perf_counter() + movetime / 1000
+
+    tt.new_search()
+    searcher = Searcher(position.copy(), tt, deadline)
+    return searcher.iterate(min(depth or MAX_PLY, MAX_PLY))
@@ -1,557 +1,366 @@
-import copy
 from typing import List, Optional, Tuple
 from ..enums.piece import Color, Piece
+from .bitboard import BLACK, ROWS, COLS, WHITE, coords, square
+from .engine import MATE_BOUND, MATE_SCORE, SearchResult
+from .movegen import find_move, legal_moves, move_to_uci
+from .zobrist import SIDE_KEY
+from .position import (
+    BLACK_KING_SIDE,
+    BLACK_QUEEN_SIDE,
+    CASTLING_FEN,
+    COLOR_INDEX,
+    COLORS,
+    FEN_CASTLING,
+    HOME_ROW,
+    KING,
+    PAWN,
+    PAWN_PUSH,
+    PIECE_INDEX,
+    PIECE_SYMBOLS,
+    PIECES,
+    ROOK,
+    WHITE_KING_SIDE,
+    WHITE_QUEEN_SIDE,
+    Position,
+)
 
-ROWS = 8
-COLS = 8
-
-initial_state = copy.deepcopy(
-    {
-        "board": [
-            [
-                Piece.bR,
-                Piece.bN,
-                Piece.bB,
-                Piece.bQ,
-                Piece.bK,
-                Piece.bB,
-                Piece.bN,
-                Piece.bR,
-            ],
-            [Piece.bP] * COLS,
-            [None] * COLS,
-            [None] * COLS,
-            [None] * COLS,
-            [None] * COLS,
-            [Piece.wP] * COLS,
-            [
-                Piece.wR,
-                Piece.wN,
-                Piece.wB,
-                Piece.wQ,
-                Piece.wK,
-                Piece.wB,
-                Piece.wN,
-                Piece.wR,
-            ],
+initial_state = Position.from_board(
+    [
+        [
+            Piece.bR,
+            Piece.bN,
+            Piece.bB,
+            Piece.bQ,
+            Piece.bK,
+            Piece.bB,
+            Piece.bN,
+            Piece.bR,
         ],
-        "turn": Color.white,
-        "castling": {
-            "white_king_side": True,
-            "white_queen_side": True,
-            "black_king_side": True,
-            "black_queen_side": True,
-        },
-        "en_passant": None,
-        "last_move": None,
-        "halfmove_clock": 0,
-        "fullmove_number": 1,
-    }
+        [Piece.bP] * COLS,
+        [None] * COLS,
+        [None] * COLS,
+        [None] * COLS,
+        [None] * COLS,
+        [Piece.wP] * COLS,
+        [
+            Piece.wR,
+            Piece.wN,
+            Piece.wB,
+            Piece.wQ,
+            Piece.wK,
+            Piece.wB,
+            Piece.wN,
+            Piece.wR,
+        ],
+    ],
+    turn=Color.white,
 )
 
-game = copy.deepcopy(initial_state)
+# Rows 0 and 7
+BACK_RANKS = 0xFF | 0xFF << 56
 
 
-def get_board(game) -> List[List[Optional[Piece]]]:
-    return game["board"]
+def new_game() -> Position:
+    return initial_state.copy()
 
 
-def reset_board(game: List[List[Optional[Piece]]]) -> None:
-    initial = initial_state
+def get_board(game: Position) -> List[List[Optional[Piece]]]:
+    squares = game.squares
+    return [
+        [None if piece is None else PIECES[piece] for piece in squares[r : r + COLS]]
+        for r in range(0, ROWS * COLS, COLS)
+    ]
 
-    game["board"] = [row[:] for row in initial["board"]]
-    game["turn"] = initial["turn"]
-    game["castling"] = initial["castling"].copy()
-    game["en_passant"] = initial["en_passant"]
-    game["last_move"] = initial["last_move"]
-    game["halfmove_clock"] = initial["halfmove_clock"]
-    game["fullmove_number"] = initial["fullmove_number"]
 
+def reset_board(game: Position) -> None:
+    game.load(initial_state)
 
-def get_turn(game) -> Color:
-    return game["turn"]
 
+def get_turn(game: Position) -> Color:
+    return COLORS[game.side]
 
-def is_within_bounds(r, c) -> bool:
-    return 0 <= r < ROWS and 0 <= c < COLS
 
+def set_turn(game: Position, color: Color) -> None:
+    if game.side != COLOR_INDEX[color]:
+        game.side = COLOR_INDEX[color]
+        game.key ^= SIDE_KEY
 
-def is_opponent(piece: Piece, target: Optional[Piece]) -> bool:
-    if target is None:
-        return False
-    return piece.name[0] != target.name[0]
 
+def get_hash(game: Position) -> str:
+    return f"{game.key:016x}"
 
-def get_king_position(game, color: Color) -> Tuple[int, int]:
-    king = Piece.wK if color == Color.white else Piece.bK
-    for r in range(ROWS):
-        for c in range(COLS):
-            if game["board"][r][c] == king:
-                return (r, c)
-    return (-1, -1)  # Should never happen
 
+def set_piece(game: Position, r: int, c: int, piece: Optional[Piece]) -> None:
+    sq = square(r, c)
+    game.remove(sq)
+    if piece is not None:
+        game.put(sq, PIECE_INDEX[piece])
+
+
+def is_within_bounds(r, c) -> bool:
+    return 0 <= r < ROWS and 0 <= c < COLS
 
-def is_square_under_attack(game, row: int, col: int, attacker_color: Color) -> bool:
-    board = game["board"]
-    for r in range(ROWS):
-        for c in range(COLS):
-            piece = board[r][c]
-            if piece and piece.name[0] == (
-                "w" if attacker_color == Color.white else "b"
-            ):
-                if can_attack(game, r, c, row, col):
-                    return True
-    return False
-
-
-def can_attack(game, from_r: int, from_c: int, to_r: int, to_c: int) -> bool:
-    piece = game["board"][from_r][from_c]
-    if not piece:
-        return False
 
-    # Rook-like movement (rook, queen)
-    if piece in {Piece.wR, Piece.bR, Piece.wQ, Piece.bQ}:
-        if from_r == to_r or from_c == to_c:
-            dr = 0 if from_r == to_r else (1 if to_r > from_r else -1)
-            dc = 0 if from_c == to_c else (1 if to_c > from_c else -1)
-            r, c = from_r + dr, from_c + dc
-            while r != to_r or c != to_c:
-                if game["board"][r][c] is not None:
-                    return False
-                r += dr
-                c += dc
-            return True
-
-    # Bishop-like movement (bishop, queen)
-    if piece in {Piece.wB, Piece.bB, Piece.wQ, Piece.bQ}:
-        if abs(from_r - to_r) == abs(from_c - to_c):
-            dr = 1 if to_r > from_r else -1
-            dc = 1 if to_c > from_c else -1
-            r, c = from_r + dr, from_c + dc
-            while r != to_r or c != to_c:
-                if game["board"][r][c] is not None:
-                    return False
-                r += dr
-                c += dc
-            return True
-
-    # Knight
-    if piece in {Piece.wN, Piece.bN}:
-        return (abs(from_r - to_r) == 2 and abs(from_c - to_c) == 1) or (
-            abs(from_r - to_r) == 1 and abs(from_c - to_c) == 2
-        )
-
-    # Pawn attacks
-    if piece in {Piece.wP, Piece.bP}:
-        direction = -1 if piece == Piece.wP else 1
-        return to_r == from_r + direction and abs(to_c - from_c) == 1
-
-    # King (adjacent squares)
-    if piece in {Piece.wK, Piece.bK}:
-        if from_r == to_r and from_c == to_c:
-            return False
-        return abs(from_r - to_r) <= 1 and abs(from_c - to_c) <= 1
-
-    return False
-
-
-def is_in_check(game) -> bool:
-    color = get_turn(game)
-    king_r, king_c = get_king_position(game, color)
-    attacker_color = Color.black if color == Color.white else Color.white
-    is_check = is_square_under_attack(game, king_r, king_c, attacker_color)
-
-    if is_check:
-        game["is_check"] = True
-    else:
-        game["is_check"] = False
-
-    return is_check
-
-
-def is_checkmate(game) -> bool:
-    color = get_turn(game)
-
-    if not is_in_check(game):
+def is_opponent(piece: Piece, target: Optional[Piece]) -> bool:
+    if target is None:
         return False
+    return piece.name[0] != target.name[0]
 
-    for r in range(ROWS):
-        for c in range(COLS):
-            piece = game["board"][r][c]
-            if piece and piece.name[0] == ("w" if color == Color.white else "b"):
-                moves = available_moves(game, r, c)
-                for move in moves:
-                    if is_move_safe(game, r, c, move[0], move[1]):
-                        return False
 
-    return True
+def get_king_position(game: Position, color: Color) -> Tuple[int, int]:
+    king = game.king_square(COLOR_INDEX[color])
+    if king < 0:
+        return (-1, -1)  # Should never happen
+    return coords(king)
 
 
-def is_stalemate(game) -> bool:
-    color = get_turn(game)
+def is_square_under_attack(
+    game: Position, row: int, col: int, attacker_color: Color
+) -> bool:
+    return game.is_attacked(square(row, col), COLOR_INDEX[attacker_color])
 
-    if is_in_check(game):
-        return False
 
-    for r in range(ROWS):
-        for c in range(COLS):
-            piece = game["board"][r][c]
-            if piece and piece.name[0] == ("w" if color == Color.white else "b"):
-                moves = available_moves(game, r, c)
-                if moves:
-                    return False
+def can_attack(game: Position, from_r: int, from_c: int, to_r: int, to_c: int) -> bool:
+    return bool(game.attacks_from(square(from_r, from_c)) >> square(to_r, to_c) & 1)
 
-    return True
 
+def is_in_check(game: Position) -> bool:
+    return game.in_check()
 
-def is_move_safe(game, from_r: int, from_c: int, to_r: int, to_c: int) -> bool:
-    # Simulate move to check if king is safe
-    original_board = [row[:] for row in game["board"]]
-    piece = game["board"][from_r][from_c]
 
-    # Handle en passant capture
-    if piece in {Piece.wP, Piece.bP} and (to_r, to_c) == game["en_passant"]:
-        game["board"][from_r][to_c] = None  # Remove captured pawn
+def is_checkmate(game: Position) -> bool:
+    return is_in_check(game) and not legal_moves(game)
 
-    # Make the move
-    game["board"][to_r][to_c] = piece
-    game["board"][from_r][from_c] = None
 
-    # Handle castling - move rook too
-    if piece in {Piece.wK, Piece.bK} and abs(from_c - to_c) == 2:
-        rook_col = 7 if to_c == 6 else 0
-        new_rook_col = 5 if to_c == 6 else 3
-        game["board"][to_r][new_rook_col] = game["board"][to_r][rook_col]
-        game["board"][to_r][rook_col] = None
+def is_stalemate(game: Position) -> bool:
+    return not is_in_check(game) and not legal_moves(game)
 
-    king_safe = not is_in_check(game)
 
-    # Restore board
-    game["board"] = original_board
-    return king_safe
+def is_move_safe(
+    game: Position, from_r: int, from_c: int, to_r: int, to_c: int
+) -> bool:
+    return game.is_legal(square(from_r, from_c), square(to_r, to_c))
 
 
-def get_sliding_moves(
-    game, r: int, c: int, directions: List[Tuple[int, int]]
+def available_moves(
+    game: Position, r: int, c: int, moves: Optional[List[int]] = None
 ) -> List[Tuple[int, int]]:
-    """Helper function for sliding pieces (rook, bishop, queen)"""
-    moves = []
-    for dr, dc in directions:
-        nr, nc = r + dr, c + dc
-        while is_within_bounds(nr, nc):
-            target = game["board"][nr][nc]
-            if target is None:
-                moves.append((nr, nc))
-            elif is_opponent(game["board"][r][c], target):
-                moves.append((nr, nc))
-                break
-            else:
-                break
-            nr += dr
-            nc += dc
-    return moves
-
+    """Destinations for the piece on (r, c).
 
-def available_moves(game, r: int, c: int) -> List[Tuple[int, int]]:
-    piece = game["board"][r][c]
-    if not piece:
+    `moves` may pass in the position's legal moves when they are already
+    known, e.g. from the position cache.
+    """
+    if not is_within_bounds(r, c):
         return []
 
-    color = get_turn(game)
+    sq = square(r, c)
+    piece = game.squares[sq]
 
     # Prevent client from making moves for opponent's pieces through requests
-    if color == Color.white and piece.name[0] != "w":
-        return []
-    elif color == Color.black and piece.name[0] != "b":
+    if piece is None or piece // 6 != game.side:
         return []
 
-    moves = []
-
-    # White Pawn
-    if piece == Piece.wP:
-        if r > 0 and game["board"][r - 1][c] is None:
-            moves.append((r - 1, c))
-            if r == 6 and game["board"][r - 2][c] is None:
-                moves.append((r - 2, c))
-
-        # Diagonal captures
-        for dc in [-1, 1]:
-            nr, nc = r - 1, c + dc
-            if not is_within_bounds(nr, nc):
-                continue
-
-            # Regular capture (opponent piece)
-            if game["board"][nr][nc] is not None and is_opponent(
-                piece, game["board"][nr][nc]
-            ):
-                moves.append((nr, nc))
-            # En passant capture
-            elif (nr, nc) == game["en_passant"]:
-                moves.append((nr, nc))
-
-    # Black Pawn
-    elif piece == Piece.bP:
-        if r < 7 and game["board"][r + 1][c] is None:
-            moves.append((r + 1, c))
-            if r == 1 and game["board"][r + 2][c] is None:
-                moves.append((r + 2, c))
-
-        # Diagonal captures
-        for dc in [-1, 1]:
-            nr, nc = r + 1, c + dc
-            if not is_within_bounds(nr, nc):
-                continue
-
-            # Regular capture (opponent piece)
-            if game["board"][nr][nc] is not None and is_opponent(
-                piece, game["board"][nr][nc]
-            ):
-                moves.append((nr, nc))
-            # En passant capture
-            elif (nr, nc) == game["en_passant"]:
-                moves.append((nr, nc))
-
-    # Rook
-    elif piece in {Piece.wR, Piece.bR}:
-        rook_directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        moves.extend(get_sliding_moves(game, r, c, rook_directions))
-
-    # Bishop
-    elif piece in {Piece.wB, Piece.bB}:
-        bishop_directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
-        moves.extend(get_sliding_moves(game, r, c, bishop_directions))
-
-    # Queen
-    elif piece in {Piece.wQ, Piece.bQ}:
-        rook_directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        bishop_directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
-        moves.extend(get_sliding_moves(game, r, c, rook_directions))
-        moves.extend(get_sliding_moves(game, r, c, bishop_directions))
-
-    # Knight
-    elif piece in {Piece.wN, Piece.bN}:
-        knight_moves = [
-            (r - 2, c - 1),
-            (r - 2, c + 1),
-            (r - 1, c - 2),
-            (r - 1, c + 2),
-            (r + 1, c - 2),
-            (r + 1, c + 2),
-            (r + 2, c - 1),
-            (r + 2, c + 1),
-        ]
-        for nr, nc in knight_moves:
-            if is_within_bounds(nr, nc) and (
-                game["board"][nr][nc] is None
-                or is_opponent(piece, game["board"][nr][nc])
-            ):
-                moves.append((nr, nc))
-
-    # King
-    elif piece in {Piece.wK, Piece.bK}:
-        king_moves = [
-            (r - 1, c - 1),
-            (r - 1, c),
-            (r - 1, c + 1),
-            (r, c - 1),
-            (r, c + 1),
-            (r + 1, c - 1),
-            (r + 1, c),
-            (r + 1, c + 1),
-        ]
-        for nr, nc in king_moves:
-            if is_within_bounds(nr, nc) and (
-                game["board"][nr][nc] is None
-                or is_opponent(piece, game["board"][nr][nc])
-            ):
-                moves.append((nr, nc))
-
-        # Castling
-        row = 7 if color == Color.white else 0
-
-        if not is_in_check(game):
-            if r == row and c == 4:  # King on starting position
-                # Kingside
-                if game["castling"][f"{color.value}_king_side"]:
-                    if (
-                        game["board"][row][5] is None
-                        and game["board"][row][6] is None
-                        and not is_square_under_attack(
-                            game,
-                            row,
-                            5,
-                            Color.black if color == Color.white else Color.white,
-                        )
-                        and not is_square_under_attack(
-                            game,
-                            row,
-                            6,
-                            Color.black if color == Color.white else Color.white,
-                        )
-                    ):
-                        moves.append((row, 6))
-
-                # Queenside
-                if game["castling"][f"{color.value}_queen_side"]:
-                    if (
-                        game["board"][row][3] is None
-                        and game["board"][row][2] is None
-                        and game["board"][row][1] is None
-                        and not is_square_under_attack(
-                            game,
-                            row,
-                            3,
-                            Color.black if color == Color.white else Color.white,
-                        )
-                        and not is_square_under_attack(
-                            game,
-                            row,
-                            2,
-                            Color.black if color == Color.white else Color.white,
-                        )
-                    ):
-                        moves.append((row, 2))
-
-    # Filter moves that would leave king in check
-    safe_moves = [move for move in moves if is_move_safe(game, r, c, move[0], move[1])]
-    return safe_moves
+    if moves is None:
+        moves = legal_moves(game)
+
+    # Promotions list the same destination once per piece; report it once
+    destinations = {}
+    for move in moves:
+        if move & 63 == sq:
+            destinations[move >> 6 & 63] = None
+    return [coords(to_sq) for to_sq in destinations]
 
 
 def make_move(
-    game, piece_pos: Tuple[int, int], update_row: int, update_col: int
+    game: Position,
+    piece_pos: Tuple[int, int],
+    update_row: int,
+    update_col: int,
+    moves: Optional[List[int]] = None,
+    promotion: int = 0,
 ) -> bool:
     r0, c0 = piece_pos
-    piece = game["board"][r0][c0]
 
-    if not piece:
+    if not is_within_bounds(r0, c0) or not is_within_bounds(update_row, update_col):
         return False
 
-    target = game["board"][update_row][update_col]
-
-    # Reset halfmove clock on captures/pawn moves
-    if piece in {Piece.wP, Piece.bP} or target is not None:
-        game["halfmove_clock"] = 0
-    else:
-        game["halfmove_clock"] += 1
+    from_sq = square(r0, c0)
+    to_sq = square(update_row, update_col)
 
-    # Validate turn
-    if game["turn"] == Color.white and piece.name[0] != "w":
-        return False
-    if game["turn"] == Color.black and piece.name[0] != "b":
+    # Validate move is legal (also rejects empty squares and pieces of the
+    # side not to move). Pawns reaching the last rank are promoted to a queen
+    # unless `promotion` names another piece type.
+    if moves is None:
+        moves = legal_moves(game)
+    move = find_move(moves, from_sq, to_sq, promotion)
+    if move is None:
         return False
 
-    # Validate move is in available moves
-    if (update_row, update_col) not in available_moves(game, r0, c0):
-        return False
+    game.push(move)
+    return True
 
-    # Update castling rights if king or rook moves
-    color = get_turn(game)
-
-    if piece in {Piece.wK, Piece.bK}:
-        game["castling"][f"{color}_king_side"] = False
-        game["castling"][f"{color}_queen_side"] = False
-
-    if piece in {Piece.wR, Piece.bR}:
-        if r0 == 7 and c0 == 0:  # White queenside rook
-            game["castling"]["white_queen_side"] = False
-        elif r0 == 7 and c0 == 7:  # White kingside rook
-            game["castling"]["white_king_side"] = False
-        elif r0 == 0 and c0 == 0:  # Black queenside rook
-            game["castling"]["black_queen_side"] = False
-        elif r0 == 0 and c0 == 7:  # Black kingside rook
-            game["castling"]["black_king_side"] = False
-
-    # Handle en passant capture
-    if piece in {Piece.wP, Piece.bP} and (update_row, update_col) == game["en_passant"]:
-        # Remove the captured pawn
-        captured_row = r0  # Same row as moving pawn before move
-        captured_col = update_col
-        game["board"][captured_row][captured_col] = None
-
-    # Handle castling - move rook too
-    if piece in {Piece.wK, Piece.bK} and abs(c0 - update_col) == 2:
-        rook_col = 7 if update_col == 6 else 0
-        new_rook_col = 5 if update_col == 6 else 3
-        rook_row = 7 if piece == Piece.wK else 0
-        game["board"][rook_row][new_rook_col] = game["board"][rook_row][rook_col]
-        game["board"][rook_row][rook_col] = None
-
-    # Make the move
-    game["board"][r0][c0] = None
-    game["board"][update_row][update_col] = piece
-
-    # Handle pawn promotion
-    if piece in {Piece.wP, Piece.bP}:
-        # White pawn reaches last rank (row 0)
-        if piece == Piece.wP and update_row == 0:
-            game["board"][update_row][update_col] = Piece.wQ
-        # Black pawn reaches last rank (row 7)
-        elif piece == Piece.bP and update_row == 7:
-            game["board"][update_row][update_col] = Piece.bQ
-
-    # Set en passant target if pawn moves two squares
-    game["en_passant"] = None
-    if piece in {Piece.wP, Piece.bP} and abs(r0 - update_row) == 2:
-        game["en_passant"] = ((r0 + update_row) // 2, c0)
-
-    # Switch turn
-    game["turn"] = Color.black if game["turn"] == Color.white else Color.white
-
-    # Increment fullmove after black's turn (after turn switch)
-    if game["turn"] == Color.white:
-        game["fullmove_number"] += 1
-
-    # Store last move for en passant
-    game["last_move"] = (piece, r0, c0, update_row, update_col)
 
+def undo_move(game: Position) -> bool:
+    if not game.history:
+        return False
+
+    game.pop()
     return True
 
 
-def generate_fen(game) -> str:
-    board = game["board"]
+class FenError(ValueError):
+    pass
+
+
+def parse_fen(fen: str) -> Position:
+    """Build a game from FEN, rejecting anything that is not a legal position."""
+    fields = fen.split(" ")
+    if len(fields) != 6:
+        raise FenError("FEN must have 6 space-separated fields")
+    placement, turn, castling, en_passant, halfmove, fullmove = fields
+
+    rows = placement.split("/")
+    if len(rows) != ROWS:
+        raise FenError("Piece placement must have 8 ranks")
+    for row in rows:
+        width = 0
+        previous_digit = False
+        for symbol in row:
+            if symbol in "12345678":
+                if previous_digit:
+                    raise FenError(f"Consecutive digits in rank {row!r}")
+                width += int(symbol)
+                previous_digit = True
+            elif symbol in PIECE_SYMBOLS:
+                width += 1
+                previous_digit = False
+            else:
+                raise FenError(f"Invalid piece symbol {symbol!r}")
+        if width != COLS:
+            raise FenError(f"Rank {row!r} does not have 8 squares")
+
+    if turn not in ("w", "b"):
+        raise FenError("Side to move must be 'w' or 'b'")
+    if castling not in FEN_CASTLING:
+        raise FenError(f"Invalid castling field {castling!r}")
+    if en_passant != "-" and not (
+        len(en_passant) == 2
+        and "a" <= en_passant[0] <= "h"
+        and en_passant[1] == ("6" if turn == "w" else "3")
+    ):
+        raise FenError(f"Invalid en passant square {en_passant!r}")
+    if not halfmove.isdigit() or not fullmove.isdigit() or int(fullmove) < 1:
+        raise FenError("Move clocks must be non-negative integers")
+
+    game = Position.from_fen(fen)
+    boards = game.boards
+    us = game.side
+    them = us ^ 1
+
+    for color in (WHITE, BLACK):
+        if boards[color * 6 + KING].bit_count() != 1:
+            raise FenError("Each side must have exactly one king")
+    if (boards[PAWN] | boards[6 + PAWN]) & BACK_RANKS:
+        raise FenError("Pawns cannot stand on the first or last rank")
+    if game.is_attacked(game.king_square(them), us):
+        raise FenError("The side not to move is in check")
+
+    for color, king_side, queen_side in (
+        (WHITE, WHITE_KING_SIDE, WHITE_QUEEN_SIDE),
+        (BLACK, BLACK_KING_SIDE, BLACK_QUEEN_SIDE),
+    ):
+        row = HOME_ROW[color]
+        king = color * 6 + KING
+        rook = color * 6 + ROOK
+        squares = game.squares
+        if game.castling & king_side and (
+            squares[square(row, 4)] != king or squares[square(row, 7)] != rook
+        ):
+            raise FenError("Castling rights without king and rook at home")
+        if game.castling & queen_side and (
+            squares[square(row, 4)] != king or squares[square(row, 0)] != rook
+        ):
+            raise FenError("Castling rights without king and rook at home")
+
+    if game.en_passant is not None:
+        # The pawn that just double-stepped must be in front of the square,
+        # with the square itself and the one it came from empty
+        step = PAWN_PUSH[us]
+        pawn = game.en_passant - step
+        if (
+            game.squares[pawn] != them * 6 + PAWN
+            or game.squares[game.en_passant] is not None
+            or game.squares[game.en_passant + step] is not None
+        ):
+            raise FenError("En passant square does not follow a double pawn push")
+
+    return game
+
+
+def generate_fen(game: Position) -> str:
+    # Everything but the clocks is determined by the Zobrist key, so the
+    # rest is only serialised again after the position changes
+    cached = game.fen_cache
+    if cached is not None and cached[0] == game.key:
+        return f"{cached[1]} {game.halfmove_clock} {game.fullmove_number}"
+
     fen_rows = []
-    for row in board:
+    for r in range(ROWS):
         fen_row = ""
         empty_count = 0
-        for piece in row:
+        for piece in game.squares[r * COLS : r * COLS + COLS]:
             if piece is None:
                 empty_count += 1
             else:
                 if empty_count > 0:
                     fen_row += str(empty_count)
                     empty_count = 0
-                fen_row += (
-                    piece.name[1].lower()
-                    if piece.name.startswith("b")
-                    else piece.name[1]
-                )
+                fen_row += PIECE_SYMBOLS[piece]
         if empty_count > 0:
             fen_row += str(empty_count)
         fen_rows.append(fen_row)
 
     placement = "/".join(fen_rows)
-    color = "w" if game["turn"] == Color.white else "b"
-    castling = (
-        "".join(
-            [
-                "K" if game["castling"]["white_king_side"] else "",
-                "Q" if game["castling"]["white_queen_side"] else "",
-                "k" if game["castling"]["black_king_side"] else "",
-                "q" if game["castling"]["black_queen_side"] else "",
-            ]
-        )
-        or "-"
-    )
+    color = "w" if game.side == WHITE else "b"
+    castling = CASTLING_FEN[game.castling]
 
     en_passant = "-"
-    if game["en_passant"]:
-        row, col = game["en_passant"]
+    if game.en_passant is not None:
+        row, col = coords(game.en_passant)
         # Convert to algebraic notation (files a-h, ranks 1-8)
         file_letter = chr(97 + col)  # 0=a, 1=b, ... 7=h
         rank_number = 8 - row  # 0=8, 1=7, ... 7=1
         en_passant = f"{file_letter}{rank_number}"
 
-    halfmove = game["halfmove_clock"]
-    fullmove = game["fullmove_number"]
-
-    return f"{placement} {color} {castling} {en_passant} {halfmove} {fullmove}"
+    prefix = f"{placement} {color} {castling} {en_passant}"
+    game.fen_cache = (game.key, prefix)
+
+    halfmove = game.halfmove_clock
+    fullmove = game.fullmove_number
+
+    return f"{prefix} {halfmove} {fullmove}"
+
+
+def describe_search(game: Position, result: SearchResult) -> dict:
+    """JSON-friendly search result; scores are from white's point of view."""
+    if result.move is None:
+        return {"bestmove": None, "depth": 0, "nodes": 0}
+
+    score = -result.score if game.side != WHITE else result.score
+    evaluation, mate = round(score / 100, 2), None
+    if abs(score) >= MATE_BOUND:
+        plies = MATE_SCORE - abs(score)
+        mate = (plies + 1) // 2 if score > 0 else -((plies + 1) // 2)
+        evaluation = None
+
+    uci = move_to_uci(result.move)
+    return {
+        "bestmove": uci,
+        "from": list(coords(result.move & 63)),
+        "to": list(coords(result.move >> 6 & 63)),
+        "promotion": uci[4:] or None,
+        "evaluation": evaluation,
+        "mate": mate,
+        "depth": result.depth,
+        "nodes": result.nodes,
+    }
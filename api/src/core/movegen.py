@@ -0,0 +1,198 @@
+"""Legal move generation for the side to move.
+
+Moves are plain ints: ``from | to << 6 | promotion << 12``, where
+``promotion`` is the piece type a pawn promotes to (0 for other moves).
+"""
+
+from typing import List, Optional
+
+from .bitboard import (
+    BETWEEN,
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    LINE,
+    PAWN_ATTACKS,
+    bishop_attacks,
+    coords,
+    iter_squares,
+    rook_attacks,
+)
+from .position import (
+    BISHOP,
+    KING,
+    KNIGHT,
+    PAWN,
+    PAWN_PUSH,
+    PAWN_START_ROW,
+    PIECE_SYMBOLS,
+    PROMOTION_ROW,
+    QUEEN,
+    ROOK,
+    Position,
+)
+
+FULL_BOARD = (1 << 64) - 1
+PROMOTIONS = (QUEEN, KNIGHT, ROOK, BISHOP)
+
+
+def encode_move(from_sq: int, to_sq: int, promotion: int = 0) -> int:
+    return from_sq | to_sq << 6 | promotion << 12
+
+
+def move_from(move: int) -> int:
+    return move & 63
+
+
+def move_to(move: int) -> int:
+    return move >> 6 & 63
+
+
+def move_promotion(move: int) -> int:
+    return move >> 12
+
+
+def move_to_uci(move: int) -> str:
+    from_r, from_c = coords(move & 63)
+    to_r, to_c = coords(move >> 6 & 63)
+    uci = f"{chr(97 + from_c)}{8 - from_r}{chr(97 + to_c)}{8 - to_r}"
+    if move >> 12:
+        uci += PIECE_SYMBOLS[6 + (move >> 12)]
+    return uci
+
+
+def find_move(
+    moves: List[int], from_sq: int, to_sq: int, promotion: int = 0
+) -> Optional[int]:
+    """Pick the move between two squares; promotions default to a queen."""
+    for move in moves:
+        if move & 63 == from_sq and move >> 6 & 63 == to_sq:
+            kind = move >> 12
+            if kind == promotion or (kind == QUEEN and not promotion):
+                return move
+    return None
+
+
+def checkers(position: Position) -> int:
+    us = position.side
+    king = position.king_square(us)
+    if king < 0:
+        return 0
+    return position.attackers(king, us ^ 1, position.occupied)
+
+
+def pinned_lines(position: Position, us: int, king: int) -> dict:
+    """Map each of our pinned pieces to the line it may still move along."""
+    them = us ^ 1
+    boards = position.boards
+    base = them * 6
+    own = position.occupancy[us]
+    enemy = position.occupancy[them]
+    occupied = own | enemy
+    queens = boards[base + QUEEN]
+    snipers = (rook_attacks(king, enemy) & (boards[base + ROOK] | queens)) | (
+        bishop_attacks(king, enemy) & (boards[base + BISHOP] | queens)
+    )
+
+    pins = {}
+    for sniper in iter_squares(snipers):
+        blockers = BETWEEN[king][sniper] & occupied
+        # Exactly one piece in between, and it is ours
+        if blockers and not blockers & (blockers - 1) and blockers & own:
+            pins[blockers.bit_length() - 1] = LINE[king][sniper]
+    return pins
+
+
+def legal_moves(position: Position) -> List[int]:
+    us = position.side
+    them = us ^ 1
+    boards = position.boards
+    own = position.occupancy[us]
+    enemy = position.occupancy[them]
+    occupied = own | enemy
+    base = us * 6
+    king = position.king_square(us)
+    moves: List[int] = []
+    append = moves.append
+
+    if king < 0:
+        return moves
+
+    # King steps: the destination must be safe once the king has left its square
+    without_king = occupied ^ (1 << king)
+    for to_sq in iter_squares(KING_ATTACKS[king] & ~own):
+        if not position.attackers(to_sq, them, without_king):
+            append(king | to_sq << 6)
+
+    checking = position.attackers(king, them, occupied)
+    if checking & (checking - 1):
+        # Double check: only the king may move
+        return moves
+
+    if checking:
+        # Capture the checker or block the line between it and the king
+        target = checking | BETWEEN[king][checking.bit_length() - 1]
+    else:
+        target = ~own & FULL_BOARD
+        for to_sq in iter_squares(position.castling_targets(king, us, occupied)):
+            append(king | to_sq << 6)
+
+    pins = pinned_lines(position, us, king)
+
+    # A pinned knight can never stay on its pin line
+    knights = boards[base + KNIGHT]
+    for sq in pins:
+        knights &= ~(1 << sq)
+    for sq in iter_squares(knights):
+        for to_sq in iter_squares(KNIGHT_ATTACKS[sq] & target):
+            append(sq | to_sq << 6)
+
+    queens = boards[base + QUEEN]
+    for sq in iter_squares(boards[base + BISHOP] | queens):
+        mask = target
+        if sq in pins:
+            mask &= pins[sq]
+        for to_sq in iter_squares(bishop_attacks(sq, occupied) & mask):
+            append(sq | to_sq << 6)
+    for sq in iter_squares(boards[base + ROOK] | queens):
+        mask = target
+        if sq in pins:
+            mask &= pins[sq]
+        for to_sq in iter_squares(rook_attacks(sq, occupied) & mask):
+            append(sq | to_sq << 6)
+
+    step = PAWN_PUSH[us]
+    start_row = PAWN_START_ROW[us]
+    promotion_row = PROMOTION_ROW[us]
+    pawn_attacks = PAWN_ATTACKS[us]
+    en_passant = position.en_passant
+    for sq in iter_squares(boards[base + PAWN]):
+        mask = target
+        if sq in pins:
+            mask &= pins[sq]
+
+        destinations = pawn_attacks[sq] & enemy & mask
+        one = sq + step
+        if not occupied >> one & 1:
+            if mask >> one & 1:
+                destinations |= 1 << one
+            two = one + step
+            if sq >> 3 == start_row and not occupied >> two & 1 and mask >> two & 1:
+                destinations |= 1 << two
+
+        for to_sq in iter_squares(destinations):
+            if to_sq >> 3 == promotion_row:
+                for promotion in PROMOTIONS:
+                    append(sq | to_sq << 6 | promotion << 12)
+            else:
+                append(sq | to_sq << 6)
+
+        # En passant can uncover a check along the rank, so it gets the
+        # exact occupancy test instead of the pin masks
+        if (
+            en_passant is not None
+            and pawn_attacks[sq] >> en_passant & 1
+            and position.is_legal(sq, en_passant)
+        ):
+            append(sq | en_passant << 6)
+
+    return moves
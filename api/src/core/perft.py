@@ -0,0 +1,130 @@
+"""Perft: count leaf nodes of the legal move tree to a fixed depth.
+
+Run from the ``api`` directory::
+
+    python -m src.core.perft --depth 4
+    python -m src.core.perft --position kiwipete --depth 3 --divide
+    python -m src.core.perft --fen "8/8/8/8/8/8/8/K6k w - - 0 1" --depth 5
+    python -m src.core.perft --suite --depth 3
+"""
+
+import argparse
+import time
+from typing import Dict, Optional
+
+from .movegen import legal_moves, move_to_uci
+from .position import Position
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# Reference positions with their known node counts per depth
+POSITIONS = {
+    "start": (START_FEN, (20, 400, 8902, 197281, 4865609)),
+    "kiwipete": (
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        (48, 2039, 97862, 4085603),
+    ),
+    "endgame": (
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        (14, 191, 2812, 43238, 674624),
+    ),
+    "promotions": (
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        (6, 264, 9467, 422333),
+    ),
+    "castling": (
+        "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+        (44, 1486, 62379, 2103487),
+    ),
+    "middlegame": (
+        "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+        (46, 2079, 89890, 3894594),
+    ),
+}
+
+
+def perft(position: Position, depth: int) -> int:
+    if depth == 0:
+        return 1
+
+    moves = legal_moves(position)
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for move in moves:
+        position.push(move)
+        nodes += perft(position, depth - 1)
+        position.pop()
+    return nodes
+
+
+def divide(position: Position, depth: int) -> Dict[str, int]:
+    """Node count below each root move, keyed by UCI move."""
+    counts = {}
+    for move in legal_moves(position):
+        position.push(move)
+        counts[move_to_uci(move)] = perft(position, depth - 1)
+        position.pop()
+    return counts
+
+
+def _run(name: str, fen: str, depth: int, expected: Optional[int], split: bool) -> bool:
+    position = Position.from_fen(fen)
+    start = time.perf_counter()
+    if split:
+        counts = divide(position, depth)
+        nodes = sum(counts.values())
+    else:
+        nodes = perft(position, depth)
+    elapsed = time.perf_counter() - start
+
+    if split:
+        for uci, count in sorted(counts.items()):
+            print(f"  {uci}: {count}")
+
+    ok = expected is None or nodes == expected
+    status = (
+        "" if expected is None else (" ok" if ok else f" FAIL (expected {expected})")
+    )
+    nps = nodes / elapsed if elapsed else 0.0
+    print(
+        f"{name} depth {depth}: {nodes} nodes in {elapsed:.3f}s "
+        f"({nps:,.0f} nps){status}"
+    )
+    return ok
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Perft for the chess move generator")
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--fen", help="position to search (overrides --position)")
+    parser.add_argument("--position", choices=sorted(POSITIONS), default="start")
+    parser.add_argument(
+        "--divide", action="store_true", help="print nodes per root move"
+    )
+    parser.add_argument(
+        "--suite", action="store_true", help="run every reference position"
+    )
+    args = parser.parse_args(argv)
+
+    if args.suite:
+        runs = [
+            (name, fen, counts[args.depth - 1] if args.depth <= len(counts) else None)
+            for name, (fen, counts) in POSITIONS.items()
+        ]
+    elif args.fen:
+        runs = [("fen", args.fen, None)]
+    else:
+        fen, counts = POSITIONS[args.position]
+        expected = counts[args.depth - 1] if 0 < args.depth <= len(counts) else None
+        runs = [(args.position, fen, expected)]
+
+    ok = True
+    for name, fen, expected in runs:
+        ok &= _run(name, fen, args.depth, expected, args.divide)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,238 @@
+"""Streaming PGN reader and replay.
+
+Games are parsed one at a time from any iterable of lines, so memory use
+does not grow with the size of the input:
+
+    python -m src.core.pgn games.pgn > results.ndjson
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from .bitboard import coords, square
+from .logic import FenError, generate_fen, make_move, new_game, parse_fen
+from .movegen import legal_moves
+from .position import PIECE_SYMBOLS, Position
+
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+CASTLING_SAN = {"O-O": 2, "0-0": 2, "O-O-O": -2, "0-0-0": -2}
+
+TAG_RE = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+TOKEN_RE = re.compile(r"[{}();]|[^\s{}();]+")
+MOVE_NUMBER_RE = re.compile(r"\d+\.+")
+SAN_RE = re.compile(r"([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQ]))?")
+
+
+class PgnGame(NamedTuple):
+    headers: Dict[str, str]
+    moves: List[str]
+    result: Optional[str]
+
+
+class PgnReader:
+    """Incremental parser: feed it lines and it returns finished games.
+
+    Comments, variations, annotation glyphs and move numbers are dropped;
+    only the main line's SAN moves are kept.
+    """
+
+    def __init__(self) -> None:
+        self.headers: Dict[str, str] = {}
+        self.moves: List[str] = []
+        self.in_comment = False
+        self.variation_depth = 0
+
+    def _finish(self, result: Optional[str]) -> PgnGame:
+        game = PgnGame(self.headers, self.moves, result)
+        self.headers = {}
+        self.moves = []
+        self.variation_depth = 0
+        return game
+
+    def feed(self, line: str) -> List[PgnGame]:
+        finished = []
+        line = line.strip()
+        if not self.in_comment and not self.variation_depth:
+            if line.startswith("%"):
+                return finished
+            if line.startswith("["):
+                # A tag after movetext starts the next game, even when the
+                # previous one is missing its result
+                if self.moves:
+                    finished.append(self._finish(None))
+                match = TAG_RE.match(line)
+                if match:
+                    value = match.group(2).replace('\\"', '"').replace("\\\\", "\\")
+                    self.headers[match.group(1)] = value
+                return finished
+
+        pos = 0
+        end = len(line)
+        while pos < end:
+            if self.in_comment:
+                close = line.find("}", pos)
+                if close < 0:
+                    break
+                self.in_comment = False
+                pos = close + 1
+                continue
+
+            match = TOKEN_RE.search(line, pos)
+            if match is None:
+                break
+            token = match.group()
+            pos = match.end()
+
+            if token == "{":
+                self.in_comment = True
+            elif token == ";":
+                break
+            elif token == "(":
+                self.variation_depth += 1
+            elif token == ")":
+                if self.variation_depth:
+                    self.variation_depth -= 1
+            elif self.variation_depth or token[0] == "$":
+                continue
+            elif token in RESULTS:
+                finished.append(self._finish(token))
+            else:
+                number = MOVE_NUMBER_RE.match(token)
+                if number:
+                    token = token[number.end() :]
+                if token:
+                    self.moves.append(token)
+        return finished
+
+    def close(self) -> List[PgnGame]:
+        if self.moves or self.headers:
+            return [self._finish(None)]
+        return []
+
+
+def read_games(lines: Iterable[str]) -> Iterator[PgnGame]:
+    reader = PgnReader()
+    for line in lines:
+        yield from reader.feed(line)
+    yield from reader.close()
+
+
+def parse_san(
+    position: Position, san: str, moves: Optional[List[int]] = None
+) -> Optional[int]:
+    """The legal move `san` names, or None if it is illegal or ambiguous."""
+    if moves is None:
+        moves = legal_moves(position)
+    san = san.rstrip("+#!?")
+
+    if san in CASTLING_SAN:
+        king = position.king_square(position.side)
+        to_sq = king + CASTLING_SAN[san]
+        for move in moves:
+            if move & 63 == king and move >> 6 & 63 == to_sq:
+                return move
+        return None
+
+    match = SAN_RE.fullmatch(san)
+    if match is None:
+        return None
+    piece, from_file, from_rank, target, promotion = match.groups()
+    kind = PIECE_SYMBOLS.index(piece or "P")
+    to_sq = square(8 - int(target[1]), ord(target[0]) - 97)
+    promotion = PIECE_SYMBOLS.index(promotion) if promotion else 0
+
+    squares = position.squares
+    found = None
+    for move in moves:
+        if move >> 6 & 63 != to_sq or move >> 12 != promotion:
+            continue
+        from_sq = move & 63
+        if squares[from_sq] % 6 != kind:
+            continue
+        if from_file and from_sq & 7 != ord(from_file) - 97:
+            continue
+        if from_rank and 8 - (from_sq >> 3) != int(from_rank):
+            continue
+        if found is not None:
+            return None
+        found = move
+    return found
+
+
+def replay_game(game: PgnGame, index: int = 1) -> dict:
+    """Play a game's moves through the rules engine.
+
+    Stops at the first move that does not resolve to a legal move.
+    """
+    result = {
+        "game": index,
+        "headers": game.headers,
+        "result": game.result or game.headers.get("Result"),
+        "valid": False,
+        "plies": 0,
+        "error": None,
+        "fen": None,
+    }
+
+    fen = game.headers.get("FEN")
+    try:
+        position = parse_fen(fen) if fen else new_game()
+    except FenError as e:
+        result["error"] = {"ply": 0, "move": None, "message": str(e)}
+        return result
+
+    for ply, san in enumerate(game.moves, start=1):
+        moves = legal_moves(position)
+        move = parse_san(position, san, moves)
+        if move is None or not make_move(
+            position, coords(move & 63), *coords(move >> 6 & 63), moves, move >> 12
+        ):
+            result["error"] = {"ply": ply, "move": san, "message": "Illegal move"}
+            break
+        result["plies"] = ply
+    else:
+        result["valid"] = True
+
+    result["fen"] = generate_fen(position)
+    return result
+
+
+def replay_games(lines: Iterable[str]) -> Iterator[dict]:
+    for index, game in enumerate(read_games(lines), start=1):
+        yield replay_game(game, index)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Validate the games in a PGN file")
+    parser.add_argument("path", help="PGN file, or - for stdin")
+    args = parser.parse_args(argv)
+
+    if args.path == "-":
+        source = sys.stdin
+    else:
+        source = open(args.path, encoding="utf-8", errors="replace")
+
+    games = invalid = plies = 0
+    start = time.perf_counter()
+    with source:
+        for result in replay_games(source):
+            games += 1
+            plies += result["plies"]
+            invalid += not result["valid"]
+            print(json.dumps(result))
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{games} games, {invalid} invalid, {plies} plies "
+        f"in {elapsed:.2f}s ({games / elapsed if elapsed else 0:,.0f} games/s)",
+        file=sys.stderr,
+    )
+    return 1 if invalid else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,440 @@
+"""Bitboard-backed chess position.
+
+Pieces are stored twice: as one 64-bit bitboard per piece type and colour
+(plus per-colour occupancy masks) for attack generation, and as a 64-entry
+mailbox of piece indices for constant-time "what is on this square" lookups.
+"""
+
+from functools import lru_cache
+from typing import List, Optional
+
+from ..enums.piece import Color, Piece
+from .bitboard import (
+    BLACK,
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    PAWN_ATTACKS,
+    SQUARES,
+    WHITE,
+    bishop_attacks,
+    coords,
+    rook_attacks,
+    square,
+)
+from .zobrist import (
+    CASTLING_KEYS,
+    EN_PASSANT_KEYS,
+    PIECE_KEYS,
+    SIDE_KEY,
+    hash_position,
+)
+
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+
+# Piece index = color * 6 + piece type
+PIECES = (
+    Piece.wP,
+    Piece.wN,
+    Piece.wB,
+    Piece.wR,
+    Piece.wQ,
+    Piece.wK,
+    Piece.bP,
+    Piece.bN,
+    Piece.bB,
+    Piece.bR,
+    Piece.bQ,
+    Piece.bK,
+)
+PIECE_INDEX = {piece: index for index, piece in enumerate(PIECES)}
+PIECE_SYMBOLS = "PNBRQKpnbrqk"
+SYMBOL_PIECES = {symbol: index for index, symbol in enumerate(PIECE_SYMBOLS)}
+
+COLORS = (Color.white, Color.black)
+COLOR_INDEX = {Color.white: WHITE, Color.black: BLACK}
+
+WHITE_KING_SIDE = 1
+WHITE_QUEEN_SIDE = 2
+BLACK_KING_SIDE = 4
+BLACK_QUEEN_SIDE = 8
+ALL_CASTLING = 15
+
+CASTLING_SYMBOLS = (
+    ("K", WHITE_KING_SIDE),
+    ("Q", WHITE_QUEEN_SIDE),
+    ("k", BLACK_KING_SIDE),
+    ("q", BLACK_QUEEN_SIDE),
+)
+
+# Every well-formed FEN castling field and the rights it grants
+FEN_CASTLING = {"-": 0}
+for _rights in range(1, ALL_CASTLING + 1):
+    FEN_CASTLING[
+        "".join(symbol for symbol, right in CASTLING_SYMBOLS if _rights & right)
+    ] = _rights
+CASTLING_FEN = {rights: field for field, rights in FEN_CASTLING.items()}
+
+# Castling rights that survive a move from or to each square
+CASTLING_MASK = [ALL_CASTLING] * SQUARES
+CASTLING_MASK[square(0, 0)] &= ~BLACK_QUEEN_SIDE
+CASTLING_MASK[square(0, 4)] &= ~(BLACK_KING_SIDE | BLACK_QUEEN_SIDE)
+CASTLING_MASK[square(0, 7)] &= ~BLACK_KING_SIDE
+CASTLING_MASK[square(7, 0)] &= ~WHITE_QUEEN_SIDE
+CASTLING_MASK[square(7, 4)] &= ~(WHITE_KING_SIDE | WHITE_QUEEN_SIDE)
+CASTLING_MASK[square(7, 7)] &= ~WHITE_KING_SIDE
+
+HOME_ROW = (7, 0)
+PAWN_START_ROW = (6, 1)
+PROMOTION_ROW = (0, 7)
+PAWN_PUSH = (-8, 8)
+
+
+@lru_cache(maxsize=4096)
+def _parse_placement(placement: str) -> tuple:
+    """Bitboards, mailbox and piece key for a FEN placement field.
+
+    Memoised because bulk loads see the same placements over and over
+    (opening positions, repeated test suites).
+    """
+    boards = [0] * 12
+    squares: List[Optional[int]] = [None] * SQUARES
+    key = 0
+    sq = 0
+    for symbol in placement:
+        piece = SYMBOL_PIECES.get(symbol)
+        if piece is not None:
+            boards[piece] |= 1 << sq
+            squares[sq] = piece
+            key ^= PIECE_KEYS[piece][sq]
+            sq += 1
+        elif symbol != "/":
+            sq += int(symbol)
+    return tuple(boards), tuple(squares), key
+
+
+class Position:
+    __slots__ = (
+        "boards",
+        "occupancy",
+        "squares",
+        "side",
+        "castling",
+        "en_passant",
+        "halfmove_clock",
+        "fullmove_number",
+        "last_move",
+        "history",
+        "key",
+        "fen_cache",
+    )
+
+    def __init__(self) -> None:
+        self.boards = [0] * 12
+        self.occupancy = [0, 0]
+        self.squares: List[Optional[int]] = [None] * SQUARES
+        self.side = WHITE
+        self.castling = 0
+        self.en_passant: Optional[int] = None
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        self.last_move = None
+        # Undo records for push/pop: (move, captured piece, castling rights,
+        # en passant square, halfmove clock, last move, Zobrist key)
+        self.history: List[tuple] = []
+        # Zobrist key, kept up to date by put/remove and push/pop
+        self.key = 0
+        # (key, FEN without move clocks) from the last generate_fen call
+        self.fen_cache: Optional[tuple] = None
+
+    @classmethod
+    def from_board(
+        cls,
+        board: List[List[Optional[Piece]]],
+        turn: Color = Color.white,
+        castling: int = ALL_CASTLING,
+    ) -> "Position":
+        position = cls()
+        for r, row in enumerate(board):
+            for c, piece in enumerate(row):
+                if piece is not None:
+                    position.put(square(r, c), PIECE_INDEX[piece])
+        position.side = COLOR_INDEX[turn]
+        position.castling = castling
+        position.key = hash_position(position)
+        return position
+
+    @classmethod
+    def from_fen(cls, fen: str) -> "Position":
+        """Build a position from FEN in one pass, without validating it."""
+        placement, turn, castling, en_passant, halfmove, fullmove = fen.split()
+        boards, squares, key = _parse_placement(placement)
+
+        position = cls.__new__(cls)
+        position.boards = list(boards)
+        position.occupancy = [
+            boards[0] | boards[1] | boards[2] | boards[3] | boards[4] | boards[5],
+            boards[6] | boards[7] | boards[8] | boards[9] | boards[10] | boards[11],
+        ]
+        position.squares = list(squares)
+        position.side = BLACK if turn == "b" else WHITE
+        position.castling = FEN_CASTLING[castling]
+        position.en_passant = (
+            None
+            if en_passant == "-"
+            else square(8 - int(en_passant[1]), ord(en_passant[0]) - 97)
+        )
+        position.halfmove_clock = int(halfmove)
+        position.fullmove_number = int(fullmove)
+        position.last_move = None
+        position.history = []
+        position.fen_cache = None
+
+        key ^= CASTLING_KEYS[position.castling]
+        if position.en_passant is not None:
+            key ^= EN_PASSANT_KEYS[position.en_passant & 7]
+        if position.side:
+            key ^= SIDE_KEY
+        position.key = key
+        return position
+
+    def copy(self) -> "Position":
+        position = Position.__new__(Position)
+        position.load(self)
+        return position
+
+    def load(self, other: "Position") -> None:
+        self.boards = other.boards[:]
+        self.occupancy = other.occupancy[:]
+        self.squares = other.squares[:]
+        self.side = other.side
+        self.castling = other.castling
+        self.en_passant = other.en_passant
+        self.halfmove_clock = other.halfmove_clock
+        self.fullmove_number = other.fullmove_number
+        self.last_move = other.last_move
+        self.history = other.history[:]
+        self.key = other.key
+        self.fen_cache = other.fen_cache
+
+    def put(self, sq: int, piece: int) -> None:
+        mask = 1 << sq
+        self.boards[piece] |= mask
+        self.occupancy[piece // 6] |= mask
+        self.squares[sq] = piece
+        self.key ^= PIECE_KEYS[piece][sq]
+
+    def remove(self, sq: int) -> Optional[int]:
+        piece = self.squares[sq]
+        if piece is not None:
+            mask = ~(1 << sq)
+            self.boards[piece] &= mask
+            self.occupancy[piece // 6] &= mask
+            self.squares[sq] = None
+            self.key ^= PIECE_KEYS[piece][sq]
+        return piece
+
+    @property
+    def occupied(self) -> int:
+        return self.occupancy[WHITE] | self.occupancy[BLACK]
+
+    def king_square(self, color: int) -> int:
+        return self.boards[color * 6 + KING].bit_length() - 1
+
+    def attackers(self, sq: int, by: int, occupied: int) -> int:
+        boards = self.boards
+        base = by * 6
+        queens = boards[base + QUEEN]
+        return (
+            (PAWN_ATTACKS[by ^ 1][sq] & boards[base + PAWN])
+            | (KNIGHT_ATTACKS[sq] & boards[base + KNIGHT])
+            | (KING_ATTACKS[sq] & boards[base + KING])
+            | (bishop_attacks(sq, occupied) & (boards[base + BISHOP] | queens))
+            | (rook_attacks(sq, occupied) & (boards[base + ROOK] | queens))
+        )
+
+    def is_attacked(self, sq: int, by: int) -> bool:
+        return self.attackers(sq, by, self.occupied) != 0
+
+    def in_check(self) -> bool:
+        king = self.king_square(self.side)
+        return king >= 0 and self.is_attacked(king, self.side ^ 1)
+
+    def attacks_from(self, sq: int) -> int:
+        """Squares the piece on `sq` attacks (pawns: diagonals only)."""
+        piece = self.squares[sq]
+        if piece is None:
+            return 0
+        kind = piece % 6
+        if kind == PAWN:
+            return PAWN_ATTACKS[piece // 6][sq]
+        if kind == KNIGHT:
+            return KNIGHT_ATTACKS[sq]
+        if kind == KING:
+            return KING_ATTACKS[sq]
+        occupied = self.occupied
+        if kind == BISHOP:
+            return bishop_attacks(sq, occupied)
+        if kind == ROOK:
+            return rook_attacks(sq, occupied)
+        return bishop_attacks(sq, occupied) | rook_attacks(sq, occupied)
+
+    def castling_targets(self, sq: int, us: int, occupied: int) -> int:
+        """King destinations for castling from `sq`, if currently allowed."""
+        row = HOME_ROW[us]
+        if sq != square(row, 4) or not self.castling:
+            return 0
+        them = us ^ 1
+        rook = us * 6 + ROOK
+        king_side, queen_side = (
+            (WHITE_KING_SIDE, WHITE_QUEEN_SIDE)
+            if us == WHITE
+            else (BLACK_KING_SIDE, BLACK_QUEEN_SIDE)
+        )
+        if self.attackers(sq, them, occupied):
+            return 0
+
+        moves = 0
+        if (
+            self.castling & king_side
+            and self.squares[sq + 3] == rook
+            and not occupied & (0b11 << (sq + 1))
+            and not self.attackers(sq + 1, them, occupied)
+            and not self.attackers(sq + 2, them, occupied)
+        ):
+            moves |= 1 << (sq + 2)
+        if (
+            self.castling & queen_side
+            and self.squares[sq - 4] == rook
+            and not occupied & (0b111 << (sq - 3))
+            and not self.attackers(sq - 1, them, occupied)
+            and not self.attackers(sq - 2, them, occupied)
+        ):
+            moves |= 1 << (sq - 2)
+        return moves
+
+    def is_legal(self, from_sq: int, to_sq: int) -> bool:
+        """Whether moving `from_sq` -> `to_sq` leaves the mover's king safe.
+
+        Works on occupancy masks only, so nothing is copied or mutated.
+        """
+        piece = self.squares[from_sq]
+        us = piece // 6
+        them = us ^ 1
+        to_mask = 1 << to_sq
+        occupied = (self.occupied & ~(1 << from_sq)) | to_mask
+        # Enemy pieces removed by the move can no longer give check
+        alive = ~to_mask
+
+        if piece % 6 == PAWN and to_sq == self.en_passant:
+            captured = to_sq - PAWN_PUSH[us]
+            occupied &= ~(1 << captured)
+            alive &= ~(1 << captured)
+
+        king = to_sq if piece % 6 == KING else self.king_square(us)
+        if king < 0:
+            return True
+        return not (self.attackers(king, them, occupied) & alive)
+
+    def push(self, move: int) -> None:
+        """Apply a move without validating it, recording how to undo it.
+
+        `move` is encoded as ``from | to << 6 | promotion << 12``; a pawn
+        reaching the last rank without a promotion piece becomes a queen.
+        """
+        from_sq = move & 63
+        to_sq = move >> 6 & 63
+        piece = self.squares[from_sq]
+        us = piece // 6
+        kind = piece % 6
+        key = self.key
+        captured = self.remove(to_sq)
+
+        if kind == PAWN and to_sq >> 3 == PROMOTION_ROW[us] and not move >> 12:
+            move |= QUEEN << 12
+
+        self.history.append(
+            (
+                move,
+                captured,
+                self.castling,
+                self.en_passant,
+                self.halfmove_clock,
+                self.last_move,
+                key,
+            )
+        )
+
+        if kind == PAWN or captured is not None:
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+
+        self.remove(from_sq)
+        self.put(to_sq, piece)
+
+        en_passant = None
+        if kind == PAWN:
+            if to_sq == self.en_passant:
+                self.remove(to_sq - PAWN_PUSH[us])
+            elif move >> 12:
+                self.remove(to_sq)
+                self.put(to_sq, us * 6 + (move >> 12))
+            elif abs(to_sq - from_sq) == 16:
+                en_passant = (from_sq + to_sq) // 2
+        elif kind == KING and abs(to_sq - from_sq) == 2:
+            if to_sq > from_sq:
+                self.put(from_sq + 1, self.remove(from_sq + 3))
+            else:
+                self.put(from_sq - 1, self.remove(from_sq - 4))
+
+        key = self.key ^ SIDE_KEY
+        if self.en_passant is not None:
+            key ^= EN_PASSANT_KEYS[self.en_passant & 7]
+        if en_passant is not None:
+            key ^= EN_PASSANT_KEYS[en_passant & 7]
+        castling = self.castling & CASTLING_MASK[from_sq] & CASTLING_MASK[to_sq]
+        if castling != self.castling:
+            key ^= CASTLING_KEYS[self.castling] ^ CASTLING_KEYS[castling]
+        self.key = key
+        self.en_passant = en_passant
+        self.castling = castling
+        self.side ^= 1
+        if self.side == WHITE:
+            self.fullmove_number += 1
+        self.last_move = (PIECES[piece], *coords(from_sq), *coords(to_sq))
+
+    def pop(self) -> int:
+        """Revert the last pushed move and return it."""
+        move, captured, castling, en_passant, halfmove_clock, last_move, key = (
+            self.history.pop()
+        )
+        from_sq = move & 63
+        to_sq = move >> 6 & 63
+
+        self.side ^= 1
+        us = self.side
+        if us == BLACK:
+            self.fullmove_number -= 1
+
+        piece = self.remove(to_sq)
+        if move >> 12:
+            piece = us * 6 + PAWN
+        self.put(from_sq, piece)
+        if captured is not None:
+            self.put(to_sq, captured)
+
+        kind = piece % 6
+        if kind == PAWN and to_sq == en_passant:
+            self.put(to_sq - PAWN_PUSH[us], (us ^ 1) * 6 + PAWN)
+        elif kind == KING and abs(to_sq - from_sq) == 2:
+            if to_sq > from_sq:
+                self.put(from_sq + 3, self.remove(from_sq + 1))
+            else:
+                self.put(from_sq - 4, self.remove(from_sq - 1))
+
+        self.castling = castling
+        self.en_passant = en_passant
+        self.halfmove_clock = halfmove_clock
+        self.last_move = last_move
+        self.key = key
+        return move
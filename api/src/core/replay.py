@@ -0,0 +1,66 @@
+"""Apply a sequence of moves to a position in one pass."""
+
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+from .bitboard import coords, square
+from .logic import generate_fen, get_hash
+from .movegen import find_move, legal_moves, move_to_uci
+from .position import PIECE_SYMBOLS, Position
+
+# A move as UCI text ("e7e8q") or as ((from_row, from_col), (to_row, to_col))
+MoveInput = Union[str, Sequence[Sequence[int]]]
+
+
+def parse_move(position: Position, text: MoveInput, moves=None) -> Optional[int]:
+    if moves is None:
+        moves = legal_moves(position)
+
+    if isinstance(text, str):
+        if not 4 <= len(text) <= 5:
+            return None
+        from_c, from_rank, to_c, to_rank = text[0], text[1], text[2], text[3]
+        if not ("a" <= from_c <= "h" and "a" <= to_c <= "h"):
+            return None
+        if not ("1" <= from_rank <= "8" and "1" <= to_rank <= "8"):
+            return None
+        promotion = 0
+        if len(text) == 5:
+            promotion = PIECE_SYMBOLS.find(text[4].lower(), 6) - 6
+            if promotion <= 0:
+                return None
+        from_sq = square(8 - int(from_rank), ord(from_c) - 97)
+        to_sq = square(8 - int(to_rank), ord(to_c) - 97)
+        return find_move(moves, from_sq, to_sq, promotion)
+
+    (from_r, from_c), (to_r, to_c) = text
+    if not all(0 <= value < 8 for value in (from_r, from_c, to_r, to_c)):
+        return None
+    return find_move(moves, square(from_r, from_c), square(to_r, to_c))
+
+
+def replay(position: Position, moves: Iterable[MoveInput]) -> Tuple[List[dict], bool]:
+    """Push each move in turn, stopping at the first illegal one.
+
+    Returns one result per attempted ply and whether every move was legal.
+    """
+    plies = []
+    for ply, text in enumerate(moves, start=1):
+        move = parse_move(position, text)
+        if move is None:
+            plies.append({"ply": ply, "input": text, "legal": False})
+            return plies, False
+
+        position.push(move)
+        plies.append(
+            {
+                "ply": ply,
+                "input": text,
+                "legal": True,
+                "move": move_to_uci(move),
+                "from": list(coords(move & 63)),
+                "to": list(coords(move >> 6 & 63)),
+                "fen": generate_fen(position),
+                "hash": get_hash(position),
+            }
+        )
+    return plies, True
@@ -0,0 +1,53 @@
+"""Compact game-state messages for push channels."""
+
+from typing import List, Optional
+
+from .bitboard import coords
+from .cache import position_cache
+from .position import COLORS, PIECES, Position
+
+
+def _moves(moves: List[int]) -> List[List[int]]:
+    # [from_row, from_col, to_row, to_col]; promotions collapse to one entry
+    seen = {}
+    for move in moves:
+        seen[move & 4095] = None
+    return [[*coords(move & 63), *coords(move >> 6)] for move in seen]
+
+
+def _status(game: Position) -> dict:
+    info = position_cache.lookup(game)
+    return {
+        "turn": COLORS[game.side],
+        "check": info.check,
+        "checkmate": info.checkmate,
+        "stalemate": info.stalemate,
+        "fen": position_cache.fen(game),
+        "moves": _moves(info.moves),
+    }
+
+
+def snapshot(game: Position) -> dict:
+    """Full state, sent when a client connects or asks for it."""
+    board = [None if piece is None else PIECES[piece].value for piece in game.squares]
+    return {
+        "type": "state",
+        "ply": len(game.history),
+        "board": [board[r : r + 8] for r in range(0, 64, 8)],
+        **_status(game),
+    }
+
+
+def delta(before: List[Optional[int]], game: Position) -> dict:
+    """Changes since `before` (a copy of the old `game.squares`)."""
+    changes = [
+        [*coords(sq), None if piece is None else PIECES[piece].value]
+        for sq, piece in enumerate(game.squares)
+        if piece != before[sq]
+    ]
+    return {
+        "type": "update",
+        "ply": len(game.history),
+        "changes": changes,
+        **_status(game),
+    }
@@ -0,0 +1,42 @@
+"""Zobrist keys for identifying positions."""
+
+import random
+from typing import TYPE_CHECKING
+
+from .bitboard import SQUARES
+
+if TYPE_CHECKING:
+    from .position import Position
+
+_rng = random.Random(0x5EED_C4E55)
+
+
+def _key() -> int:
+    return _rng.getrandbits(64)
+
+
+# PIECE_KEYS[piece][sq]
+PIECE_KEYS = [[_key() for _ in range(SQUARES)] for _ in range(12)]
+# One key per castling-rights bitmask, so updates are a single xor pair
+_CASTLING_BITS = [_key() for _ in range(4)]
+CASTLING_KEYS = [0] * 16
+for _rights in range(16):
+    for _bit in range(4):
+        if _rights >> _bit & 1:
+            CASTLING_KEYS[_rights] ^= _CASTLING_BITS[_bit]
+EN_PASSANT_KEYS = [_key() for _ in range(8)]  # by file
+SIDE_KEY = _key()  # xored in when black is to move
+
+
+def hash_position(position: "Position") -> int:
+    """Key computed from scratch; positions keep theirs up to date in `key`."""
+    key = 0
+    for sq, piece in enumerate(position.squares):
+        if piece is not None:
+            key ^= PIECE_KEYS[piece][sq]
+    key ^= CASTLING_KEYS[position.castling]
+    if position.en_passant is not None:
+        key ^= EN_PASSANT_KEYS[position.en_passant & 7]
+    if position.side:
+        key ^= SIDE_KEY
+    return key
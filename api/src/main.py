@@ -1,21 +1,36 @@
-from fastapi import FastAPI, APIRouter
+import codecs
+import json
+from typing import AsyncIterator, Dict, Optional, Set
+from fastapi import FastAPI, APIRouter, HTTPException, Query, Request, WebSocket
+from fastapi import WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from .requests.request import MovesRequest, MoveRequest
+from .requests.request import FenRequest, MovesRequest, MoveRequest, ReplayRequest
 from .core.logic import (
-    game,
     get_board,
     get_turn,
     available_moves,
-    is_stalemate,
     make_move,
-    generate_fen,
+    undo_move,
+    get_hash,
     reset_board,
-    is_in_check,
-    is_checkmate,
+    new_game,
+    generate_fen,
+    describe_search,
+    parse_fen,
+    FenError,
 )
+from .core.cache import analyze, position_cache
+from .core.engine import MAX_MOVETIME, MAX_PLY, search
+from .core.pgn import PgnReader, replay_game
+from .core.position import Position
+from .core.replay import replay
+from .core.state import delta, snapshot
+from .sessions.store import create_store
 
 app = FastAPI()
 router = APIRouter(prefix="/api")
+store = create_store()
 
 app.add_middleware(
     CORSMiddleware,
@@ -26,56 +41,257 @@ app.add_middleware(
 )
 
 
+def load_game(game_id: str) -> Position:
+    game = store.get(game_id)
+    if game is None:
+        raise HTTPException(status_code=404, detail="Game not found")
+    return game
+
+
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
 
 
-@router.get("/board")
-def get_board_endpoint():
-    return get_board(game)
+@router.get("/cache-stats")
+def cache_stats_endpoint():
+    return position_cache.stats()
 
 
-@router.get("/turn")
-def get_turn_endpoint():
-    return get_turn(game)
+@router.post("/games")
+def create_game_endpoint():
+    return {"game_id": store.create()}
 
 
-@router.get("/fen")
-def get_fen():
-    return {"fen": generate_fen(game)}
+@router.delete("/games/{game_id}")
+def delete_game_endpoint(game_id: str):
+    store.delete(game_id)
+    return {"status": "Game deleted successfully"}
+
+
+@router.get("/games/{game_id}/board")
+def get_board_endpoint(game_id: str):
+    return get_board(load_game(game_id))
+
+
+@router.get("/games/{game_id}/turn")
+def get_turn_endpoint(game_id: str):
+    return get_turn(load_game(game_id))
+
 
+@router.get("/games/{game_id}/fen")
+def get_fen(game_id: str):
+    return {"fen": position_cache.fen(load_game(game_id))}
 
-@router.get("/game-condition")
-def game_condition_endpoint():
-    if is_checkmate(game):
+
+@router.get("/games/{game_id}/hash")
+def get_hash_endpoint(game_id: str):
+    return {"hash": get_hash(load_game(game_id))}
+
+
+@router.get("/games/{game_id}/game-condition")
+def game_condition_endpoint(game_id: str):
+    game = load_game(game_id)
+    info = position_cache.lookup(game)
+
+    if info.checkmate:
         reset_board(game)
+        store.save(game_id, game)
         return {"checkmate": True, "check": False}
 
-    if is_in_check(game):
+    if info.check:
         return {"checkmate": False, "check": True}
 
-    if is_stalemate(game):
+    if info.stalemate:
         reset_board(game)
+        store.save(game_id, game)
         return {"checkmate": False, "check": False, "stalemate": True}
 
     return {"checkmate": False, "check": False, "stalemate": False}
 
 
-@router.post("/reset-board")
-def reset_board_endpoint():
+@router.post("/games/{game_id}/reset-board")
+def reset_board_endpoint(game_id: str):
+    game = load_game(game_id)
     reset_board(game)
+    store.save(game_id, game)
     return {"status": "Board reset successfully"}
 
 
-@router.post("/moves")
-def available_moves_endpoint(req: MovesRequest):
-    return available_moves(game, req.row, req.col)
+@router.post("/games/{game_id}/load-fen")
+def load_fen_endpoint(game_id: str, req: FenRequest):
+    game = load_game(game_id)
+    try:
+        game.load(parse_fen(req.fen))
+    except FenError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    store.save(game_id, game)
+    return {"fen": generate_fen(game)}
+
+
+@router.post("/games/{game_id}/moves")
+def available_moves_endpoint(game_id: str, req: MovesRequest):
+    game = load_game(game_id)
+    return available_moves(game, req.row, req.col, position_cache.lookup(game).moves)
+
+
+@router.post("/games/{game_id}/move")
+def move_endpoint(game_id: str, req: MoveRequest):
+    game = load_game(game_id)
+    moves = position_cache.lookup(game).moves
+    moved = make_move(game, req.piece, req.update_row, req.update_col, moves)
+    if moved:
+        store.save(game_id, game)
+    return [moved]
+
 
+@router.post("/games/{game_id}/takeback")
+def takeback_endpoint(game_id: str):
+    game = load_game(game_id)
+    undone = undo_move(game)
+    if undone:
+        store.save(game_id, game)
+    return [undone]
 
-@router.post("/move")
-def move_endpoint(req: MoveRequest):
-    return [make_move(game, req.piece, req.update_row, req.update_col)]
+
+@router.get("/games/{game_id}/bestmove")
+def best_move_endpoint(
+    game_id: str,
+    depth: Optional[int] = Query(None, ge=1, le=MAX_PLY),
+    movetime: Optional[int] = Query(None, ge=1, le=MAX_MOVETIME),
+):
+    game = load_game(game_id)
+    return describe_search(game, search(game, depth=depth, movetime=movetime))
+
+
+@router.post("/replay")
+def replay_endpoint(req: ReplayRequest):
+    try:
+        game = parse_fen(req.fen) if req.fen else new_game()
+    except FenError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    plies, valid = replay(game, req.moves)
+    info = analyze(game)
+    return {
+        "valid": valid,
+        "plies": plies,
+        "final": {
+            "fen": generate_fen(game),
+            "hash": get_hash(game),
+            "check": info.check,
+            "checkmate": info.checkmate,
+            "stalemate": info.stalemate,
+        },
+    }
+
+
+async def read_lines(request: Request) -> AsyncIterator[str]:
+    # Decode the body as it arrives rather than buffering the upload
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    async for chunk in request.stream():
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+@router.post("/pgn")
+async def pgn_endpoint(request: Request):
+    """Replay every game in a PGN body, one NDJSON result per game."""
+
+    async def results() -> AsyncIterator[str]:
+        reader = PgnReader()
+        index = 0
+        async for line in read_lines(request):
+            for game in reader.feed(line):
+                index += 1
+                yield json.dumps(replay_game(game, index)) + "\n"
+        for game in reader.close():
+            index += 1
+            yield json.dumps(replay_game(game, index)) + "\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
 
 
 app.include_router(router)
+
+# Open sockets per game in this worker, so every viewer gets each ply
+connections: Dict[str, Set[WebSocket]] = {}
+
+
+async def broadcast(game_id: str, message: dict) -> None:
+    for socket in list(connections.get(game_id, ())):
+        try:
+            await socket.send_json(message)
+        except Exception:
+            connections[game_id].discard(socket)
+
+
+@app.websocket("/ws/game/{game_id}")
+async def game_socket(websocket: WebSocket, game_id: str):
+    await websocket.accept()
+    if store.get(game_id) is None:
+        await websocket.close(code=4404, reason="Game not found")
+        return
+
+    connections.setdefault(game_id, set()).add(websocket)
+    try:
+        await websocket.send_json(snapshot(store.get(game_id)))
+        while True:
+            try:
+                command = await websocket.receive_json()
+            except ValueError:
+                await websocket.send_json({"type": "error", "message": "Invalid JSON"})
+                continue
+
+            game = store.get(game_id)
+            if game is None:
+                await websocket.close(code=4404, reason="Game not found")
+                return
+
+            kind = command.get("type") if isinstance(command, dict) else None
+            before = game.squares[:]
+            if kind == "move":
+                try:
+                    (r0, c0), (r1, c1) = command["from"], command["to"]
+                    moves = position_cache.lookup(game).moves
+                    changed = make_move(
+                        game, (int(r0), int(c0)), int(r1), int(c1), moves
+                    )
+                except (KeyError, TypeError, ValueError):
+                    changed = False
+            elif kind == "takeback":
+                changed = undo_move(game)
+            elif kind == "reset":
+                reset_board(game)
+                changed = True
+            elif kind == "state":
+                await websocket.send_json(snapshot(game))
+                continue
+            else:
+                await websocket.send_json(
+                    {"type": "error", "message": f"Unknown command: {kind}"}
+                )
+                continue
+
+            if not changed:
+                await websocket.send_json(
+                    {"type": "error", "message": f"Rejected {kind}"}
+                )
+                continue
+
+            store.save(game_id, game)
+            await broadcast(game_id, delta(before, game))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sockets = connections.get(game_id)
+        if sockets is not None:
+            sockets.discard(websocket)
+            if not sockets:
+                del connections[game_id]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Tuple
+from typing import List, Optional, Tuple, Union
 from ..enums.piece import Piece
 
 
@@ -13,3 +13,13 @@ class MoveRequest(BaseModel):
     piece: Tuple[int, int]
     update_row: int
     update_col: int
+
+
+class FenRequest(BaseModel):
+    fen: str
+
+
+class ReplayRequest(BaseModel):
+    fen: Optional[str] = None
+    # UCI strings ("e2e4", "e7e8n") or ((from_row, from_col), (to_row, to_col))
+    moves: List[Union[str, Tuple[Tuple[int, int], Tuple[int, int]]]]
@@ -0,0 +1,160 @@
+"""Game session storage.
+
+Each game lives under its own ID. `MemoryStore` keeps positions in-process
+with LRU and TTL eviction; `RedisStore` serialises them so several uvicorn
+workers can share the same sessions.
+"""
+
+import os
+import time
+import uuid
+from array import array
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from ..core.logic import generate_fen, new_game
+from ..core.position import Position
+
+# Undo records kept per game. Anything older than the fifty-move window can
+# never matter for the rules, so this bounds per-game memory without losing
+# anything but very deep takebacks.
+MAX_HISTORY = 256
+
+DEFAULT_TTL = 60 * 60 * 6
+DEFAULT_MAX_SESSIONS = 10_000
+
+
+def new_game_id() -> str:
+    return uuid.uuid4().hex
+
+
+def trim_history(game: Position, max_history: int = MAX_HISTORY) -> None:
+    if len(game.history) > max_history:
+        del game.history[:-max_history]
+
+
+def encode_game(game: Position) -> bytes:
+    """Serialise a game as its base FEN followed by the 16-bit move codes."""
+    base = game.copy()
+    moves = array("H")
+    while base.history:
+        moves.append(base.pop())
+    moves.reverse()
+    return generate_fen(base).encode() + b"\n" + moves.tobytes()
+
+
+def decode_game(data: bytes) -> Position:
+    fen, _, packed = data.partition(b"\n")
+    game = Position.from_fen(fen.decode())
+    moves = array("H")
+    moves.frombytes(packed)
+    for move in moves:
+        game.push(move)
+    return game
+
+
+class SessionStore:
+    def create(self) -> str:
+        game_id = new_game_id()
+        self.save(game_id, new_game())
+        return game_id
+
+    def get(self, game_id: str) -> Optional[Position]:
+        raise NotImplementedError
+
+    def save(self, game_id: str, game: Position) -> None:
+        raise NotImplementedError
+
+    def delete(self, game_id: str) -> None:
+        raise NotImplementedError
+
+
+class MemoryStore(SessionStore):
+    def __init__(
+        self,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        ttl: float = DEFAULT_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.clock = clock
+        # game_id -> (game, last access), least recently used first
+        self.sessions: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def get(self, game_id: str) -> Optional[Position]:
+        entry = self.sessions.get(game_id)
+        if entry is None:
+            return None
+
+        now = self.clock()
+        game, last_access = entry
+        if now - last_access > self.ttl:
+            del self.sessions[game_id]
+            return None
+
+        self.sessions[game_id] = (game, now)
+        self.sessions.move_to_end(game_id)
+        return game
+
+    def save(self, game_id: str, game: Position) -> None:
+        trim_history(game)
+        self.sessions[game_id] = (game, self.clock())
+        self.sessions.move_to_end(game_id)
+        self.evict()
+
+    def delete(self, game_id: str) -> None:
+        self.sessions.pop(game_id, None)
+
+    def evict(self) -> None:
+        while len(self.sessions) > self.max_sessions:
+            self.sessions.popitem(last=False)
+
+        now = self.clock()
+        while self.sessions:
+            _, (_, last_access) = next(iter(self.sessions.items()))
+            if now - last_access <= self.ttl:
+                break
+            self.sessions.popitem(last=False)
+
+
+class RedisStore(SessionStore):
+    """Sessions shared through Redis; expiry is handled by key TTLs."""
+
+    def __init__(self, client, ttl: float = DEFAULT_TTL, prefix: str = "chess:game:"):
+        self.client = client
+        self.ttl = int(ttl)
+        self.prefix = prefix
+
+    def get(self, game_id: str) -> Optional[Position]:
+        key = self.prefix + game_id
+        data = self.client.get(key)
+        if data is None:
+            return None
+        self.client.expire(key, self.ttl)
+        return decode_game(data)
+
+    def save(self, game_id: str, game: Position) -> None:
+        trim_history(game)
+        self.client.set(self.prefix + game_id, encode_game(game), ex=self.ttl)
+
+    def delete(self, game_id: str) -> None:
+        self.client.delete(self.prefix + game_id)
+
+
+def create_store() -> SessionStore:
+    """Build the store configured through the environment."""
+    ttl = float(os.environ.get("CHESS_SESSION_TTL", DEFAULT_TTL))
+    if os.environ.get("CHESS_SESSION_BACKEND", "memory") == "redis":
+        import redis
+
+        client = redis.Redis.from_url(
+            os.environ.get("CHESS_REDIS_URL", "redis://localhost:6379/0")
+        )
+        return RedisStore(client, ttl=ttl)
+
+    max_sessions = int(os.environ.get("CHESS_MAX_SESSIONS", DEFAULT_MAX_SESSIONS))
+    return MemoryStore(max_sessions=max_sessions, ttl=ttl)
@@ -0,0 +1,130 @@
+import json
+import unittest
+from fastapi.testclient import TestClient
+from src.main import app
+
+
+class TestGameApi(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(app)
+        self.game_id = self.client.post("/api/games").json()["game_id"]
+
+    def url(self, path):
+        return f"/api/games/{self.game_id}{path}"
+
+    def test_board_and_turn(self):
+        board = self.client.get(self.url("/board")).json()
+        self.assertEqual(board[0][0], "bR")
+        self.assertIsNone(board[4][4])
+        self.assertEqual(self.client.get(self.url("/turn")).json(), "white")
+
+    def test_move_flow(self):
+        moves = self.client.post(
+            self.url("/moves"), json={"piece": "wP", "row": 6, "col": 4}
+        )
+        self.assertEqual(sorted(map(tuple, moves.json())), [(4, 4), (5, 4)])
+        res = self.client.post(
+            self.url("/move"), json={"piece": [6, 4], "update_row": 4, "update_col": 4}
+        )
+        self.assertEqual(res.json(), [True])
+        self.assertEqual(self.client.get(self.url("/turn")).json(), "black")
+        self.assertEqual(
+            self.client.get(self.url("/game-condition")).json(),
+            {"checkmate": False, "check": False, "stalemate": False},
+        )
+        self.assertEqual(self.client.post(self.url("/takeback")).json(), [True])
+        self.assertEqual(self.client.get(self.url("/turn")).json(), "white")
+
+    def test_hash_changes_with_position(self):
+        start = self.client.get(self.url("/hash")).json()["hash"]
+        self.assertEqual(len(start), 16)
+        self.client.post(
+            self.url("/move"), json={"piece": [6, 4], "update_row": 4, "update_col": 4}
+        )
+        self.assertNotEqual(self.client.get(self.url("/hash")).json()["hash"], start)
+
+    def test_games_are_independent(self):
+        other = self.client.post("/api/games").json()["game_id"]
+        self.client.post(
+            self.url("/move"), json={"piece": [6, 4], "update_row": 4, "update_col": 4}
+        )
+        self.assertEqual(self.client.get(f"/api/games/{other}/turn").json(), "white")
+
+    def test_load_fen(self):
+        fen = "4k3/8/8/8/8/8/4P3/4K3 b - - 3 40"
+        res = self.client.post(self.url("/load-fen"), json={"fen": fen})
+        self.assertEqual(res.json(), {"fen": fen})
+        self.assertEqual(self.client.get(self.url("/turn")).json(), "black")
+        self.assertEqual(self.client.get(self.url("/fen")).json(), {"fen": fen})
+
+        res = self.client.post(self.url("/load-fen"), json={"fen": "4k3/8 w - - 0 1"})
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(self.client.get(self.url("/fen")).json(), {"fen": fen})
+
+    def test_cache_stats(self):
+        self.client.get(self.url("/fen"))
+        self.client.get(self.url("/game-condition"))
+        stats = self.client.get("/api/cache-stats").json()
+        self.assertGreaterEqual(stats["hits"], 1)
+        self.assertIn("hit_rate", stats)
+
+    def test_websocket_pushes_one_delta_per_ply(self):
+        with self.client.websocket_connect(f"/ws/game/{self.game_id}") as ws:
+            state = ws.receive_json()
+            self.assertEqual(state["type"], "state")
+            self.assertEqual(len(state["moves"]), 20)
+
+            ws.send_json({"type": "move", "from": [6, 4], "to": [4, 4]})
+            update = ws.receive_json()
+            self.assertEqual(update["type"], "update")
+            self.assertEqual(update["turn"], "black")
+            self.assertEqual(
+                sorted(map(tuple, update["changes"])), [(4, 4, "wP"), (6, 4, None)]
+            )
+            self.assertIn("4P3", update["fen"])
+
+            ws.send_json({"type": "move", "from": [6, 3], "to": [4, 3]})
+            self.assertEqual(ws.receive_json()["type"], "error")
+
+            ws.send_json({"type": "takeback"})
+            self.assertEqual(ws.receive_json()["turn"], "white")
+        self.assertEqual(self.client.get(self.url("/turn")).json(), "white")
+
+    def test_replay_batch(self):
+        res = self.client.post(
+            "/api/replay",
+            json={"moves": ["f2f3", "e7e5", [[6, 6], [4, 6]], "d8h4"]},
+        ).json()
+        self.assertTrue(res["valid"])
+        self.assertEqual([ply["move"] for ply in res["plies"]][-1], "d8h4")
+        self.assertTrue(res["final"]["checkmate"])
+
+    def test_replay_stops_at_illegal_move(self):
+        fen = "4k3/1P6/8/8/8/8/8/4K3 w - - 0 1"
+        res = self.client.post(
+            "/api/replay", json={"fen": fen, "moves": ["b7b8n", "e8e7", "e1e3"]}
+        ).json()
+        self.assertFalse(res["valid"])
+        self.assertEqual([ply["legal"] for ply in res["plies"]], [True, True, False])
+        self.assertTrue(res["plies"][0]["fen"].startswith("1N2k3/"))
+        self.assertEqual(res["final"]["fen"], res["plies"][1]["fen"])
+
+    def test_pgn_stream(self):
+        pgn = '[Event "a"]\n\n1. f3 e5 2. g4 Qh4# 0-1\n\n[Event "b"]\n\n1. e5 *\n'
+        res = self.client.post("/api/pgn", content=pgn)
+        self.assertEqual(res.headers["content-type"], "application/x-ndjson")
+        first, second = [json.loads(line) for line in res.text.splitlines()]
+        self.assertTrue(first["valid"])
+        self.assertEqual(first["result"], "0-1")
+        self.assertFalse(second["valid"])
+
+    def test_replay_rejects_bad_fen(self):
+        res = self.client.post("/api/replay", json={"fen": "nonsense", "moves": []})
+        self.assertEqual(res.status_code, 400)
+
+    def test_unknown_game(self):
+        self.assertEqual(self.client.get("/api/games/missing/board").status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+from src.core.cache import PositionCache
+from src.core.logic import generate_fen, make_move, new_game, reset_board
+from src.core.position import Position
+
+
+class TestPositionCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = PositionCache(capacity=2)
+
+    def test_filled_once_per_position(self):
+        game = new_game()
+        first = self.cache.lookup(game)
+        self.assertIs(self.cache.lookup(game), first)
+        self.assertEqual(len(first.moves), 20)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_moves_change_the_entry(self):
+        game = new_game()
+        before = self.cache.lookup(game)
+        make_move(game, (6, 4), 4, 4)
+        self.assertIsNot(self.cache.lookup(game), before)
+        reset_board(game)
+        self.assertIs(self.cache.lookup(game), before)
+
+    def test_fen_uses_current_clocks(self):
+        game = new_game()
+        for move in [((7, 6), 5, 5), ((0, 6), 2, 5), ((5, 5), 7, 6), ((2, 5), 0, 6)]:
+            make_move(game, *move)
+        # Same position as the start, different clocks
+        self.assertEqual(self.cache.fen(game), generate_fen(game))
+        self.assertEqual(self.cache.fen(new_game()), generate_fen(new_game()))
+
+    def test_game_status(self):
+        mate = Position.from_fen("3R2k1/5ppp/8/8/8/8/5PPP/6K1 b - - 1 1")
+        info = self.cache.lookup(mate)
+        self.assertTrue(info.checkmate and info.check and not info.stalemate)
+        stalemate = Position.from_fen("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1")
+        info = self.cache.lookup(stalemate)
+        self.assertTrue(info.stalemate and not info.check)
+
+    def test_bounded_size(self):
+        game = new_game()
+        self.cache.lookup(game)
+        make_move(game, (6, 4), 4, 4)
+        self.cache.lookup(game)
+        make_move(game, (1, 4), 3, 4)
+        self.cache.lookup(game)
+        self.assertEqual(self.cache.stats()["size"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from src.core.engine import MATE_BOUND, TranspositionTable, search
+from src.core.logic import describe_search, new_game
+from src.core.movegen import move_to_uci
+from src.core.position import Position
+
+
+class TestEngine(unittest.TestCase):
+    def test_finds_back_rank_mate(self):
+        game = Position.from_fen("6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1")
+        result = search(game, depth=3)
+        self.assertEqual(move_to_uci(result.move), "d1d8")
+        self.assertGreaterEqual(result.score, MATE_BOUND)
+        self.assertEqual(describe_search(game, result)["mate"], 1)
+
+    def test_black_to_mate_reports_negative_mate(self):
+        game = Position.from_fen("3r2k1/5ppp/8/8/8/8/5PPP/6K1 b - - 0 1")
+        info = describe_search(game, search(game, depth=3))
+        self.assertEqual(info["bestmove"], "d8d1")
+        self.assertEqual(info["mate"], -1)
+
+    def test_captures_hanging_queen(self):
+        game = Position.from_fen("4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1")
+        self.assertEqual(move_to_uci(search(game, depth=2).move), "d2d5")
+
+    def test_search_leaves_game_untouched(self):
+        game = new_game()
+        search(game, depth=2)
+        self.assertEqual(game.history, [])
+
+    def test_respects_movetime(self):
+        result = search(new_game(), movetime=200)
+        self.assertIsNotNone(result.move)
+        self.assertLess(result.elapsed, 1.0)
+
+    def test_no_moves_in_checkmate(self):
+        game = Position.from_fen("3R2k1/5ppp/8/8/8/8/5PPP/6K1 b - - 1 1")
+        self.assertIsNone(search(game, depth=2).move)
+
+    def test_transposition_table_replacement(self):
+        tt = TranspositionTable(size_bits=2)
+        tt.store(1, 5, 0, 10, 99)
+        tt.store(5, 1, 0, 20, 98)  # same slot, shallower: kept out
+        self.assertEqual(tt.probe(1)[3], 10)
+        tt.new_search()
+        tt.store(5, 1, 0, 20, 98)  # older entry is replaced
+        self.assertIsNone(tt.probe(1))
+        self.assertEqual(tt.probe(5)[4], 98)
+
+
+if __name__ == "__main__":
+    unittest.main()
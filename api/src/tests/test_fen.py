@@ -0,0 +1,52 @@
+import unittest
+from src.core.logic import FenError, generate_fen, make_move, new_game, parse_fen
+from src.core.perft import POSITIONS, START_FEN
+from src.core.zobrist import hash_position
+
+
+class TestFen(unittest.TestCase):
+    def test_round_trip(self):
+        for name, (fen, _) in POSITIONS.items():
+            with self.subTest(position=name):
+                game = parse_fen(fen)
+                self.assertEqual(generate_fen(game), fen)
+                self.assertEqual(game.key, hash_position(game))
+
+    def test_en_passant_round_trip(self):
+        fen = "rnbqkbnr/ppp1pppp/8/8/3pP3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 3"
+        self.assertEqual(generate_fen(parse_fen(fen)), fen)
+
+    def test_memoized_fen_follows_moves(self):
+        game = new_game()
+        self.assertEqual(generate_fen(game), START_FEN)
+        make_move(game, (6, 4), 4, 4)
+        self.assertEqual(
+            generate_fen(game),
+            "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1",
+        )
+        game.pop()
+        self.assertEqual(generate_fen(game), START_FEN)
+
+    def test_rejects_invalid(self):
+        invalid = [
+            "",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq -",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP w KQkq - 0 1",
+            "rnbqkbnr/pppppppp/9/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+            "rnbqkbnr/pppppppp/44/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+            "rnbqkbnr/ppppxppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR x KQkq - 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkx - 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq e3 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - -1 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 0",
+            "rnbqqbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQ - 0 1",
+            "rnbqkbnP/pppppppp/8/8/8/8/PPPPPPP1/RNBQKBNR w KQq - 0 1",
+            "4k3/8/8/8/8/8/4R3/4K3 w - - 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBN1 w KQkq - 0 1",
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR b KQkq e3 0 1",
+        ]
+        for fen in invalid:
+            with self.subTest(fen=fen):
+                with self.assertRaises(FenError):
+                    parse_fen(fen)
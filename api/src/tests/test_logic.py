@@ -1,32 +1,36 @@
 # test.py
 import unittest
-import copy
-from core.logic import (
+from src.core.logic import (
     initial_state,
     get_board,
     get_turn,
+    set_piece,
+    set_turn,
+    available_moves,
+    legal_moves,
     make_move,
+    undo_move,
     is_in_check,
     is_checkmate,
     generate_fen,
 )
-from enums.piece import Color, Piece
+from src.enums.piece import Color, Piece
 
 
 class TestChessLogic(unittest.TestCase):
     def setUp(self):
         global game
-        game = copy.deepcopy(initial_state)
+        game = initial_state.copy()
 
     def test_initial_board_setup(self):
         # Test back rank pieces
-        self.assertEqual(game["board"][0][0], Piece.bR)
-        self.assertEqual(game["board"][7][4], Piece.wK)
+        self.assertEqual(get_board(game)[0][0], Piece.bR)
+        self.assertEqual(get_board(game)[7][4], Piece.wK)
         # Test pawns
-        self.assertEqual(game["board"][1][3], Piece.bP)
-        self.assertEqual(game["board"][6][5], Piece.wP)
+        self.assertEqual(get_board(game)[1][3], Piece.bP)
+        self.assertEqual(get_board(game)[6][5], Piece.wP)
         # Test empty squares
-        self.assertIsNone(game["board"][3][2])
+        self.assertIsNone(get_board(game)[3][2])
 
     def test_pawn_movement(self):
         # Valid white pawn move
@@ -38,7 +42,7 @@ class TestChessLogic(unittest.TestCase):
 
     def test_bishop_blocked_movement(self):
         # Clear pawn blocking white bishop
-        get_board(game)[6][1] = None
+        set_piece(game, 6, 1, None)
         # Valid bishop move
         self.assertTrue(make_move(game, (7, 2), 5, 0))  # White bishop c1 to a3
         # Blocked bishop move (should fail, path blocked by pawn)
@@ -56,11 +60,11 @@ class TestChessLogic(unittest.TestCase):
 
     def test_castling(self):
         # Clear path for castling
-        get_board(game)[7][1] = None
-        get_board(game)[7][2] = None
-        get_board(game)[7][3] = None
-        get_board(game)[7][5] = None  # Also clear f1
-        get_board(game)[7][6] = None
+        set_piece(game, 7, 1, None)
+        set_piece(game, 7, 2, None)
+        set_piece(game, 7, 3, None)
+        set_piece(game, 7, 5, None)  # Also clear f1
+        set_piece(game, 7, 6, None)
 
         # Kingside castle
         self.assertTrue(make_move(game, (7, 4), 7, 6))
@@ -73,11 +77,11 @@ class TestChessLogic(unittest.TestCase):
         for r in range(8):
             for c in range(8):
                 if get_board(game)[r][c] == Piece.wQ:
-                    get_board(game)[r][c] = None
+                    set_piece(game, r, c, None)
         # Place white queen at (1, 4) to attack black king at (0, 4)
-        get_board(game)[1][4] = Piece.wQ
+        set_piece(game, 1, 4, Piece.wQ)
         # Set turn to black
-        game["turn"] = Color.black
+        set_turn(game, Color.black)
         self.assertTrue(is_in_check(game))
         self.assertEqual(get_turn(game), Color.black)
 
@@ -89,6 +93,63 @@ class TestChessLogic(unittest.TestCase):
         make_move(game, (0, 3), 4, 7)  # Qh4
         self.assertTrue(is_checkmate(game))
 
+    def test_knight_moves_from_start(self):
+        self.assertEqual(sorted(available_moves(game, 7, 1)), [(5, 0), (5, 2)])
+        # Black pieces cannot move on white's turn
+        self.assertEqual(available_moves(game, 0, 1), [])
+
+    def test_moves_must_resolve_check(self):
+        make_move(game, (6, 4), 4, 4)  # e4
+        make_move(game, (1, 3), 2, 3)  # d6
+        make_move(game, (7, 5), 3, 1)  # Bb5+
+        # Only blocking moves or king moves are legal for black
+        self.assertTrue(is_in_check(game))
+        self.assertEqual(available_moves(game, 0, 6), [])  # Knight g8
+        self.assertIn((1, 3), available_moves(game, 0, 2))  # Bd7 blocks
+
+    def test_pinned_piece_cannot_move(self):
+        set_piece(game, 6, 4, None)  # Open the e-file
+        set_piece(game, 5, 4, Piece.wN)  # Knight on e3
+        set_piece(game, 2, 4, Piece.bR)  # Rook on e6 pins it to the king
+        self.assertEqual(available_moves(game, 5, 4), [])
+
+    def test_legal_moves_from_start(self):
+        self.assertEqual(len(legal_moves(game)), 20)
+
+    def test_castling_rights_lost_after_rook_move(self):
+        make_move(game, (6, 7), 4, 7)  # h4
+        make_move(game, (1, 0), 2, 0)  # a6
+        make_move(game, (7, 7), 5, 7)  # Rh3
+        self.assertIn(" b Qkq ", generate_fen(game))
+
+    def test_undo_move_restores_position(self):
+        start_fen = generate_fen(game)
+        make_move(game, (6, 4), 4, 4)  # e4
+        make_move(game, (1, 3), 3, 3)  # d5
+        make_move(game, (4, 4), 3, 3)  # exd5
+        self.assertTrue(undo_move(game))
+        self.assertEqual(get_board(game)[3][3], Piece.bP)
+        self.assertTrue(undo_move(game))
+        self.assertTrue(undo_move(game))
+        self.assertEqual(generate_fen(game), start_fen)
+        self.assertFalse(undo_move(game))
+
+    def test_undo_en_passant_and_castling(self):
+        set_piece(game, 7, 5, None)
+        set_piece(game, 7, 6, None)
+        make_move(game, (6, 4), 4, 4)  # e4
+        make_move(game, (1, 0), 2, 0)  # a6
+        make_move(game, (4, 4), 3, 4)  # e5
+        make_move(game, (1, 3), 3, 3)  # d5
+        before = generate_fen(game)
+        make_move(game, (3, 4), 2, 3)  # exd6 e.p.
+        self.assertIsNone(get_board(game)[3][3])
+        undo_move(game)
+        self.assertEqual(generate_fen(game), before)
+        make_move(game, (7, 4), 7, 6)  # O-O
+        undo_move(game)
+        self.assertEqual(generate_fen(game), before)
+
     def test_fen_generation(self):
         make_move(game, (6, 0), 4, 0)  # White pawn
         fen = generate_fen(game)
@@ -0,0 +1,41 @@
+import unittest
+from src.core.perft import POSITIONS, divide, perft
+from src.core.position import Position
+from src.core.logic import generate_fen
+
+# Deepest depth per reference position that keeps the suite quick
+DEPTHS = {
+    "start": 4,
+    "kiwipete": 3,
+    "endgame": 4,
+    "promotions": 3,
+    "castling": 3,
+    "middlegame": 3,
+}
+
+
+class TestPerft(unittest.TestCase):
+    def test_reference_positions(self):
+        for name, depth in DEPTHS.items():
+            fen, counts = POSITIONS[name]
+            for d in range(1, depth + 1):
+                with self.subTest(position=name, depth=d):
+                    self.assertEqual(perft(Position.from_fen(fen), d), counts[d - 1])
+
+    def test_perft_leaves_position_unchanged(self):
+        fen, _ = POSITIONS["kiwipete"]
+        position = Position.from_fen(fen)
+        perft(position, 3)
+        self.assertEqual(generate_fen(position), fen)
+        self.assertEqual(position.history, [])
+
+    def test_divide_sums_to_perft(self):
+        fen, counts = POSITIONS["kiwipete"]
+        split = divide(Position.from_fen(fen), 2)
+        self.assertEqual(len(split), counts[0])
+        self.assertEqual(sum(split.values()), counts[1])
+        self.assertEqual(split["e1g1"], 43)
+
+
+if __name__ == "__main__":
+    unittest.main()
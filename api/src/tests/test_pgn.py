@@ -0,0 +1,67 @@
+import unittest
+from src.core.logic import parse_fen
+from src.core.movegen import move_to_uci
+from src.core.pgn import parse_san, read_games, replay_game, replay_games
+
+PGN = """[Event "Opera Game"]
+[White "Morphy"]
+[Black "Duke Karl / Count Isouard"]
+[Result "1-0"]
+
+1. e4 e5 2. Nf3 d6 3. d4 Bg4 {This is a weak move} 4. dxe5 Bxf3 5. Qxf3
+dxe5 6. Bc4 Nf6 7. Qb3 Qe7 8. Nc3 c6 9. Bg5 (9. Be3 Qb4) b5 10. Nxb5 cxb5
+11. Bxb5+ Nbd7 12. O-O-O Rd8 13. Rxd7 Rxd7 14. Rd1 Qe6 15. Bxd7+ Nxd7
+16. Qb8+ Nxb8 17. Rd8# 1-0
+
+[Event "Broken"]
+[Result "*"]
+
+1. e4 e5 2. Ke3 *
+"""
+
+
+class TestPgn(unittest.TestCase):
+    def test_read_games(self):
+        games = list(read_games(PGN.splitlines()))
+        self.assertEqual(len(games), 2)
+        self.assertEqual(games[0].headers["White"], "Morphy")
+        self.assertEqual(len(games[0].moves), 33)
+        self.assertEqual(games[0].moves[16], "Bg5")
+        self.assertEqual(games[0].result, "1-0")
+        self.assertEqual(games[1].moves, ["e4", "e5", "Ke3"])
+
+    def test_replay(self):
+        first, second = replay_games(PGN.splitlines())
+        self.assertTrue(first["valid"])
+        self.assertEqual(first["plies"], 33)
+        self.assertEqual(
+            first["fen"], "1n1Rkb1r/p4ppp/4q3/4p1B1/4P3/8/PPP2PPP/2K5 b k - 1 17"
+        )
+        self.assertFalse(second["valid"])
+        self.assertEqual(second["plies"], 2)
+        self.assertEqual(second["error"]["ply"], 3)
+        self.assertEqual(second["error"]["move"], "Ke3")
+
+    def test_san_disambiguation_and_promotion(self):
+        position = parse_fen("4k3/1P6/8/8/8/8/8/R3K2R w KQ - 0 1")
+        cases = {
+            "Rad1": "a1d1",
+            "Rhd1": "h1d1",
+            "O-O": "e1g1",
+            "O-O-O": "e1c1",
+            "b8=N": "b7b8n",
+            "b8Q+": "b7b8q",
+        }
+        for san, uci in cases.items():
+            with self.subTest(san=san):
+                self.assertEqual(move_to_uci(parse_san(position, san)), uci)
+        self.assertIsNone(parse_san(position, "Rd1"))
+        self.assertIsNone(parse_san(position, "b8"))
+
+    def test_set_up_position(self):
+        (game,) = read_games(
+            ['[FEN "4k3/8/8/8/8/8/4P3/4K3 w - - 0 1"]', "", "1. e4 Kd7 *"]
+        )
+        result = replay_game(game)
+        self.assertTrue(result["valid"])
+        self.assertEqual(result["fen"], "8/3k4/8/8/4P3/8/8/4K3 w - - 1 2")
@@ -0,0 +1,109 @@
+import unittest
+from src.core.logic import generate_fen, make_move, new_game, undo_move
+from src.sessions.store import (
+    MAX_HISTORY,
+    MemoryStore,
+    RedisStore,
+    decode_game,
+    encode_game,
+)
+
+
+class FakeRedis:
+    """Just enough of the redis client API for RedisStore."""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+        self.ttls[key] = ex
+
+    def expire(self, key, ttl):
+        self.ttls[key] = ttl
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def play_opening(game):
+    make_move(game, (6, 4), 4, 4)  # e4
+    make_move(game, (1, 3), 3, 3)  # d5
+    make_move(game, (4, 4), 3, 3)  # exd5
+
+
+class TestSessionStore(unittest.TestCase):
+    def test_encode_round_trip_keeps_history(self):
+        game = new_game()
+        play_opening(game)
+        restored = decode_game(encode_game(game))
+        self.assertEqual(generate_fen(restored), generate_fen(game))
+        self.assertEqual(len(restored.history), 3)
+        self.assertTrue(undo_move(restored))
+        self.assertEqual(restored.squares[27], 6)  # Black pawn back on d5
+
+    def test_memory_store_isolates_games(self):
+        store = MemoryStore()
+        first, second = store.create(), store.create()
+        play_opening(store.get(first))
+        self.assertNotEqual(
+            generate_fen(store.get(first)), generate_fen(store.get(second))
+        )
+
+    def test_memory_store_evicts_least_recently_used(self):
+        store = MemoryStore(max_sessions=2)
+        first, second = store.create(), store.create()
+        store.get(first)
+        third = store.create()
+        self.assertIsNone(store.get(second))
+        self.assertIsNotNone(store.get(first))
+        self.assertIsNotNone(store.get(third))
+
+    def test_memory_store_expires_idle_games(self):
+        clock = FakeClock()
+        store = MemoryStore(ttl=10, clock=clock)
+        game_id = store.create()
+        clock.now = 5
+        self.assertIsNotNone(store.get(game_id))
+        clock.now = 16
+        self.assertIsNone(store.get(game_id))
+        self.assertEqual(len(store), 0)
+
+    def test_history_is_bounded(self):
+        store = MemoryStore()
+        game_id = store.create()
+        game = store.get(game_id)
+        for _ in range(MAX_HISTORY):
+            make_move(game, (7, 6), 5, 5)  # Nf3
+            make_move(game, (0, 6), 2, 5)  # Nf6
+            make_move(game, (5, 5), 7, 6)  # Ng1
+            make_move(game, (2, 5), 0, 6)  # Ng8
+        store.save(game_id, game)
+        self.assertEqual(len(store.get(game_id).history), MAX_HISTORY)
+
+    def test_redis_store_shares_sessions(self):
+        client = FakeRedis()
+        worker_a, worker_b = RedisStore(client, ttl=60), RedisStore(client, ttl=60)
+        game_id = worker_a.create()
+        game = worker_a.get(game_id)
+        play_opening(game)
+        worker_a.save(game_id, game)
+        self.assertEqual(generate_fen(worker_b.get(game_id)), generate_fen(game))
+        worker_b.delete(game_id)
+        self.assertIsNone(worker_a.get(game_id))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+from src.core.logic import get_hash, make_move, new_game, set_piece, set_turn
+from src.core.movegen import legal_moves
+from src.core.perft import POSITIONS
+from src.core.position import Position
+from src.core.zobrist import hash_position
+from src.enums.piece import Color, Piece
+
+
+def walk(test, position, depth):
+    test.assertEqual(position.key, hash_position(position))
+    if depth == 0:
+        return
+    for move in legal_moves(position):
+        key = position.key
+        position.push(move)
+        walk(test, position, depth - 1)
+        position.pop()
+        test.assertEqual(position.key, key)
+
+
+class TestZobrist(unittest.TestCase):
+    def test_incremental_key_matches_full_hash(self):
+        for name in ("kiwipete", "promotions", "endgame"):
+            with self.subTest(position=name):
+                walk(self, Position.from_fen(POSITIONS[name][0]), 2)
+
+    def test_transpositions_share_a_key(self):
+        first, second = new_game(), new_game()
+        for game, order in ((first, (0, 1, 2, 3)), (second, (2, 1, 0, 3))):
+            moves = [((7, 6), 5, 5), ((0, 6), 2, 5), ((7, 1), 5, 2), ((0, 1), 2, 2)]
+            for index in order:
+                make_move(game, *moves[index])
+        self.assertEqual(get_hash(first), get_hash(second))
+        self.assertNotEqual(get_hash(first), get_hash(new_game()))
+
+    def test_editing_the_board_keeps_key_in_sync(self):
+        game = new_game()
+        set_piece(game, 6, 4, None)
+        set_piece(game, 4, 4, Piece.wQ)
+        set_turn(game, Color.black)
+        self.assertEqual(game.key, hash_position(game))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,14 +13,11 @@ interface BoardProps {
 
 function Board({ mode, onReturnToMenu, botLevel }: BoardProps) {
   type Cell = Piece | null;
-  type FenResponse = { fen: string }
   type GameConditionResponse = { checkmate: boolean, check: boolean, stalemate: boolean }
-  type StockFishData = {
-    bestmove?: string;
-    continuation?: string;
+  type BestMoveData = {
+    bestmove: string | null;
     evaluation?: number | null;
     mate?: number | null;
-    success?: boolean;
   };
 
   const [board, setBoard] = useState<Cell[][]>([]);
@@ -30,12 +27,17 @@ function Board({ mode, onReturnToMenu, botLevel }: BoardProps) {
   const [selectedPiece, setSelectedPiece] = useState<[number, number] | null>(null);
   const [isBotThinking, setIsBotThinking] = useState(false);
   const [evaluation, setEvaluation] = useState<number | null>(null);
+  const [gameId, setGameId] = useState<string | null>(null);
+
+  const gamePath = (endpoint: string, id: string | null = gameId) => `/games/${id}${endpoint}`;
 
   useEffect(() => {
     const init = (async () => {
       try {
-        await sendRequest("/board", setBoard)
-        await sendRequest("/turn", setTurn)
+        const { game_id } = await sendRequest<{ game_id: string }>("/games", null, methods.POST);
+        setGameId(game_id);
+        await sendRequest(gamePath("/board", game_id), setBoard)
+        await sendRequest(gamePath("/turn", game_id), setTurn)
       }
       catch (err) {
         console.error(err);
@@ -50,23 +52,25 @@ function Board({ mode, onReturnToMenu, botLevel }: BoardProps) {
   }, [])
 
   useEffect(() => {
+    if (gameId === null) return;
+
     if (bot && turn === Color.black && !isBotThinking) {
       makeBotMove();
     }
 
     const checkForGameCondition = async () => {
       try {
-        const res = await sendRequest<GameConditionResponse>("/game-condition");
-        await sendRequest("/turn", setTurn);
+        const res = await sendRequest<GameConditionResponse>(gamePath("/game-condition"));
+        await sendRequest(gamePath("/turn"), setTurn);
 
         if (res.checkmate) {
           alert("Checkmate! Game over. " + (turn === Color.white ? "Black" : "White") + " wins!");
-          await sendRequest("/board", setBoard);
+          await sendRequest(gamePath("/board"), setBoard);
           setEvaluation(null);
         }
         else if (res.stalemate) {
           alert("Stalemate! The game is a draw.");
-          await sendRequest("/board", setBoard);
+          await sendRequest(gamePath("/board"), setBoard);
           setEvaluation(null);
         }
         else if (res.check && turn === Color.white) {
@@ -78,7 +82,7 @@ function Board({ mode, onReturnToMenu, botLevel }: BoardProps) {
     }
 
     checkForGameCondition();
-  }, [turn, bot])
+  }, [turn, bot, gameId])
 
   async function handleCellClick(row: number, col: number) {
     try {
@@ -97,9 +101,9 @@ function Board({ mode, onReturnToMenu, botLevel }: BoardProps) {
   async function move(row: number, col: number) {
     try {
       Promise.all([
-        await sendRequest("/move", null, methods.POST, { piece: selectedPiece, update_row: row, update_col: col }),
-        await sendRequest("/turn", setTurn),
-        await sendRequest("/board", setBoard),
+        await sendRequest(gamePath("/move"), null, methods.POST, { piece: selectedPiece, update_row: row, update_col: col }),
+        await sendRequest(gamePath("/turn"), setTurn),
+        await sendRequest(gamePath("/board"), setBoard),
       ]);
 
       setPossibleMoves([]);
@@ -114,17 +118,15 @@ function Board({ mode, onReturnToMenu, botLevel }: BoardProps) {
     setIsBotThinking(true);
 
     try {
-      const stockFishData = await getStockFishData();
-      const bestMoveMatch = stockFishData.bestmove?.match(/bestmove (\w+)/);
+      const bestMoveData = await getBestMoveData();
 
-      setEval(stockFishData);
+      setEval(bestMoveData);
 
-      if (!bestMoveMatch) {
-        throw new Error("Stockfish API error: No move found in response");
+      if (!bestMoveData.bestmove) {
+        throw new Error("Engine error: No move found in response");
       }
 
-      const uciMove = bestMoveMatch[1];
-      await executeBotMove(uciMove);
+      await executeBotMove(bestMoveData.bestmove);
     } catch (err) {
       console.error("Bot move failed:", err);
     } finally {
@@ -132,38 +134,31 @@ function Board({ mode, onReturnToMenu, botLevel }: BoardProps) {
     }
   };
 
-  const getStockFishData = async () => {
-    const fenRes = await sendRequest<FenResponse>("/fen");
-
-    let depth = 1;
+  const getBestMoveData = async () => {
+    let search = "";
 
     switch (botLevel) {
       case BotDifficulty.easy:
+        search = "depth=1";
         break;
       case BotDifficulty.medium:
-        depth = 4;
+        search = "depth=3&movetime=500";
         break;
       case BotDifficulty.hard:
-        depth = 12;
+        search = "movetime=900";
         break;
       default:
         throw new Error(`Unknown bot level: ${botLevel}`);
     }
 
-    const stockfishRes = await fetch(
-      `https://www.stockfish.online/api/s/v2.php?fen=${encodeURIComponent(fenRes.fen)}&depth=${depth}`
-    );
-
-    const stockFishData: StockFishData = await stockfishRes.json();
-
-    return stockFishData;
+    return await sendRequest<BestMoveData>(gamePath(`/bestmove?${search}`));
   }
 
-  const setEval = (stockFishData: StockFishData) => {
-    if (stockFishData.evaluation !== null && stockFishData.evaluation !== undefined) {
-      setEvaluation(stockFishData.evaluation);
-    } else if (stockFishData.mate !== null && stockFishData.mate !== undefined) {
-      setEvaluation(stockFishData.mate);
+  const setEval = (bestMoveData: BestMoveData) => {
+    if (bestMoveData.evaluation !== null && bestMoveData.evaluation !== undefined) {
+      setEvaluation(bestMoveData.evaluation);
+    } else if (bestMoveData.mate !== null && bestMoveData.mate !== undefined) {
+      setEvaluation(bestMoveData.mate);
     } else {
       setEvaluation(0);
     }
@@ -180,15 +175,15 @@ function Board({ mode, onReturnToMenu, botLevel }: BoardProps) {
       throw new Error(`Invalid UCI move: ${uciMove}`);
     }
 
-    await sendRequest("/move", null, "POST", {
+    await sendRequest(gamePath("/move"), null, "POST", {
       piece: [fromRow, fromCol],
       update_row: toRow,
       update_col: toCol
     });
 
     await Promise.all([
-      sendRequest("/board", setBoard),
-      sendRequest("/turn", setTurn)
+      sendRequest(gamePath("/board"), setBoard),
+      sendRequest(gamePath("/turn"), setTurn)
     ]);
   };
 
@@ -201,7 +196,7 @@ function Board({ mode, onReturnToMenu, botLevel }: BoardProps) {
 
     setSelectedPiece([row, col]);
     try {
-      await sendRequest("/moves", setPossibleMoves, methods.POST, { piece: cell, row, col })
+      await sendRequest(gamePath("/moves"), setPossibleMoves, methods.POST, { piece: cell, row, col })
     } catch (err) {
       console.error("Failed to fetch moves:", err);
     }
@@ -227,9 +222,9 @@ function Board({ mode, onReturnToMenu, botLevel }: BoardProps) {
   }
 
   async function resetBoard() {
-    await sendRequest("/reset-board", null, methods.POST);
-    await sendRequest("/board", setBoard);
-    await sendRequest("/turn", setTurn);
+    await sendRequest(gamePath("/reset-board"), null, methods.POST);
+    await sendRequest(gamePath("/board"), setBoard);
+    await sendRequest(gamePath("/turn"), setTurn);
     setEvaluation(null);
     setPossibleMoves([]);
     setSelectedPiece(null);